@@ -7,20 +7,16 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from AviaxMusic import LOGGER, app, userbot
 from AviaxMusic.core.call import Aviax
+from AviaxMusic.core.health import silence_file
 from AviaxMusic.misc import sudo
 from AviaxMusic.plugins import ALL_MODULES
+from AviaxMusic.utils import executors, http, ytpool
 from AviaxMusic.utils.database import get_banned_users, get_gbanned
 from config import BANNED_USERS
 
 
 async def init():
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
+    if not any(config.STRING_SESSIONS):
         LOGGER(__name__).error("Assistant client variables not defined, exiting...")
         exit()
     await sudo()
@@ -37,10 +33,11 @@ async def init():
     for all_module in ALL_MODULES:
         importlib.import_module("AviaxMusic.plugins" + all_module)
     LOGGER("AviaxMusic.plugins").info("Successfully Imported Modules...")
+    await ytpool.start()
     await userbot.start()
     await Aviax.start()
     try:
-        await Aviax.stream_call("https://te.legra.ph/file/29f784eb49d230ab62e9e.mp4")
+        await Aviax.stream_call(silence_file(), video=False)
     except NoActiveGroupCall:
         LOGGER("AviaxMusic").error(
             "Please turn on the videochat of your log group\channel.\n\nStopping Bot..."
@@ -55,6 +52,9 @@ async def init():
     await idle()
     await app.stop()
     await userbot.stop()
+    await http.close()
+    ytpool.stop()
+    executors.shutdown()
     LOGGER("AviaxMusic").info("Stopping Aviax Music Bot...")
 
 
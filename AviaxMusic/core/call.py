@@ -1,21 +1,21 @@
 import asyncio
-import os
+import time
 from datetime import datetime, timedelta
 from typing import Union
 
 from ntgcalls import ConnectionNotFound, TelegramServerError
-from pyrogram import Client
-from pyrogram.types import InlineKeyboardMarkup
 
 from pytgcalls import PyTgCalls, exceptions, types
 from pytgcalls.pytgcalls_session import PyTgCallsSession
 
 import config
-from AviaxMusic import LOGGER, YouTube, app
+from AviaxMusic import LOGGER, YouTube, app, userbot
+from AviaxMusic.core.userbot import assistants, quarantine, startup, startup_report
 from AviaxMusic.misc import db
 from AviaxMusic.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    get_assistant_number,
     get_lang,
     get_loop,
     group_assistant,
@@ -26,16 +26,19 @@ from AviaxMusic.utils.database import (
     set_loop,
 )
 from AviaxMusic.utils.exceptions import AssistantErr
-from AviaxMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
-from AviaxMusic.utils.inline.play import stream_markup
+from AviaxMusic.utils.formatters import check_duration, seconds_to_min
+from AviaxMusic.utils.scheduler import record_join_failure
+from AviaxMusic.utils.stream import playlist, position, prefetch
 from AviaxMusic.utils.stream.autoclear import auto_clean
-from AviaxMusic.utils.thumbnails import gen_thumb
+from AviaxMusic.utils.stream.notify import now_playing
+from AviaxMusic.utils.stream.speed import live_parameters, render
 from strings import get_string
 
 autoend = {}
 counter = {}
 
 async def _clear_(chat_id: int):
+    prefetch.cancel(chat_id)
     db[chat_id] = []
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
@@ -44,45 +47,12 @@ class Call(PyTgCalls):
     def __init__(self):
         PyTgCallsSession.notice_displayed = True
 
-        self.userbot1 = Client(
-            name="AviaxAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
+        self.pool = userbot.pool.map(
+            lambda number, client: PyTgCalls(client, cache_duration=100)
         )
-        self.one = PyTgCalls(self.userbot1, cache_duration=100)
 
-        self.userbot2 = Client(
-            name="AviaxAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(self.userbot2, cache_duration=100)
-
-        self.userbot3 = Client(
-            name="AviaxAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(self.userbot3, cache_duration=100)
-
-        self.userbot4 = Client(
-            name="AviaxAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-        )
-        self.four = PyTgCalls(self.userbot4, cache_duration=100)
-
-        self.userbot5 = Client(
-            name="AviaxAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-        )
-        self.five = PyTgCalls(self.userbot5, cache_duration=100)
+    def get(self, number: int) -> PyTgCalls:
+        return self.pool.get(number)
 
     def _build_stream(
         self,
@@ -127,10 +97,14 @@ class Call(PyTgCalls):
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause(chat_id)
+        if db.get(chat_id):
+            position.pause(db[chat_id][0])
 
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume(chat_id)
+        if db.get(chat_id):
+            position.resume(db[chat_id][0])
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -141,15 +115,7 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        for string, client in [
-            (config.STRING1, self.one),
-            (config.STRING2, self.two),
-            (config.STRING3, self.three),
-            (config.STRING4, self.four),
-            (config.STRING5, self.five),
-        ]:
-            if not string:
-                continue
+        for client in self.pool:
             try:
                 await client.leave_call(chat_id, close=False)
             except Exception:
@@ -159,49 +125,32 @@ class Call(PyTgCalls):
         except Exception:
             pass
 
-    async def speedup_stream(self, chat_id: int, file_path, speed, playing):
+    async def speedup_stream(
+        self, chat_id: int, file_path, speed, playing, progress=None
+    ):
         assistant = await group_assistant(self, chat_id)
-        if str(speed) != "1.0":
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == "0.5":
-                    vs = 2.0
-                elif str(speed) == "0.75":
-                    vs = 1.35
-                elif str(speed) == "1.5":
-                    vs = 0.68
-                elif str(speed) == "2.0":
-                    vs = 0.5
-                else:
-                    vs = 1.0
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await proc.communicate()
+        entry = playing[0]
+        speed = float(speed)
+        # Position and length on the original timeline, whatever speed is on now.
+        source_played = position.elapsed(entry) * float(entry.get("speed") or 1.0)
+        source_seconds = int(entry.get("old_second") or entry["seconds"])
+        if config.SPEED_MODE == "render" and speed != 1.0:
+            out = await render(file_path, speed, source_seconds, progress)
+            dur = await asyncio.get_event_loop().run_in_executor(
+                None, check_duration, out
+            )
+            dur = int(dur)
+            con_seconds = int(source_played / speed)
+            xx = f"-ss {seconds_to_min(con_seconds)} -to {seconds_to_min(dur)}"
         else:
-            out = file_path
-        dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
-        xx = f"-ss {played} -to {duration}"
-        video_mode = playing[0]["streamtype"] == "video"
-        stream = self._build_stream(out, video=video_mode, ffmpeg=xx)
+            out = None
+            dur = int(source_seconds / speed)
+            con_seconds = int(source_played / speed)
+            xx = f"-ss {seconds_to_min(int(source_played))}"
+            if speed != 1.0:
+                xx = f"{xx} {live_parameters(speed)}"
+        video_mode = entry["streamtype"] == "video"
+        stream = self._build_stream(out or file_path, video=video_mode, ffmpeg=xx)
         if str(db[chat_id][0]["file"]) == str(file_path):
             await self._play_on_assistant(assistant, chat_id, stream)
         else:
@@ -211,8 +160,8 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
-            db[chat_id][0]["dur"] = duration
+            position.start(db[chat_id][0], con_seconds)
+            db[chat_id][0]["dur"] = seconds_to_min(dur)
             db[chat_id][0]["seconds"] = dur
             db[chat_id][0]["speed_path"] = out
             db[chat_id][0]["speed"] = speed
@@ -242,9 +191,11 @@ class Call(PyTgCalls):
         stream = self._build_stream(link, video=bool(video))
         await self._play_on_assistant(assistant, chat_id, stream)
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, speed=None):
         assistant = await group_assistant(self, chat_id)
         ffmpeg = f"-ss {to_seek} -to {duration}"
+        if speed and float(speed) != 1.0:
+            ffmpeg = f"{ffmpeg} {live_parameters(float(speed))}"
         video_mode = mode == "video"
         stream = self._build_stream(
             file_path,
@@ -253,9 +204,10 @@ class Call(PyTgCalls):
         )
         await self._play_on_assistant(assistant, chat_id, stream)
 
-    async def stream_call(self, link):
-        assistant = await group_assistant(self, config.LOG_GROUP_ID)
-        stream = self._build_stream(link, video=True)
+    async def stream_call(self, link, assistant: PyTgCalls = None, video: bool = True):
+        if assistant is None:
+            assistant = await group_assistant(self, config.LOG_GROUP_ID)
+        stream = self._build_stream(link, video=video)
         await self._play_on_assistant(assistant, config.LOG_GROUP_ID, stream)
         await asyncio.sleep(0.2)
         try:
@@ -282,8 +234,10 @@ class Call(PyTgCalls):
         except exceptions.NoAudioSourceFound:
             raise AssistantErr(_["call_10"])
         except (ConnectionNotFound, TelegramServerError):
+            record_join_failure(await get_assistant_number(chat_id))
             raise AssistantErr(_["call_10"])
         except Exception:
+            record_join_failure(await get_assistant_number(chat_id))
             raise AssistantErr(_["call_10"])
         await add_active_chat(chat_id)
         await music_on(chat_id)
@@ -306,6 +260,7 @@ class Call(PyTgCalls):
                 loop = loop - 1
                 await set_loop(chat_id, loop)
             await auto_clean(popped)
+            await playlist.ready(chat_id)
             if not check:
                 await _clear_(chat_id)
                 return await client.leave_call(chat_id, close=False)
@@ -323,7 +278,7 @@ class Call(PyTgCalls):
         original_chat_id = check[0]["chat_id"]
         streamtype = check[0]["streamtype"]
         videoid = check[0]["vidid"]
-        db[chat_id][0]["played"] = 0
+        position.reset(db[chat_id][0])
         exis = (check[0]).get("old_dur")
         if exis:
             db[chat_id][0]["dur"] = exis
@@ -346,34 +301,37 @@ class Call(PyTgCalls):
                     original_chat_id,
                     text=_["call_6"],
                 )
-            img = await gen_thumb(videoid)
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
-                chat_id=original_chat_id,
-                photo=img,
-                caption=_["stream_1"].format(
+            now_playing(
+                chat_id,
+                original_chat_id,
+                "stream_1",
+                (
                     f"https://t.me/{app.username}?start=info_{videoid}",
                     title[:23],
                     check[0]["dur"],
                     user,
                 ),
-                reply_markup=InlineKeyboardMarkup(button),
+                "tg",
+                thumb=videoid,
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
         elif "vid_" in queued:
-            mystic = await app.send_message(original_chat_id, _["call_7"])
-            try:
-                file_path, direct = await YouTube.download(
-                    videoid,
-                    mystic,
-                    videoid=True,
-                    video=video,
-                )
-            except Exception:
-                return await mystic.edit_text(
-                    _["call_6"], disable_web_page_preview=True
-                )
+            mystic = None
+            fetched = await prefetch.take(chat_id, videoid, video)
+            if fetched:
+                file_path, direct = fetched
+            else:
+                mystic = await app.send_message(original_chat_id, _["call_7"])
+                try:
+                    file_path, direct = await YouTube.download(
+                        videoid,
+                        mystic,
+                        videoid=True,
+                        video=video,
+                    )
+                except Exception:
+                    return await mystic.edit_text(
+                        _["call_6"], disable_web_page_preview=True
+                    )
             stream = self._build_stream(file_path, video=video)
             try:
                 await self._play_on_assistant(client, chat_id, stream)
@@ -382,22 +340,20 @@ class Call(PyTgCalls):
                     original_chat_id,
                     text=_["call_6"],
                 )
-            img = await gen_thumb(videoid)
-            button = stream_markup(_, chat_id)
-            await mystic.delete()
-            run = await app.send_photo(
-                chat_id=original_chat_id,
-                photo=img,
-                caption=_["stream_1"].format(
+            now_playing(
+                chat_id,
+                original_chat_id,
+                "stream_1",
+                (
                     f"https://t.me/{app.username}?start=info_{videoid}",
                     title[:23],
                     check[0]["dur"],
                     user,
                 ),
-                reply_markup=InlineKeyboardMarkup(button),
+                "stream",
+                thumb=videoid,
+                cleanup=[mystic],
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
 
         elif "index_" in queued:
             stream = self._build_stream(videoid, video=video)
@@ -408,15 +364,14 @@ class Call(PyTgCalls):
                     original_chat_id,
                     text=_["call_6"],
                 )
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
-                chat_id=original_chat_id,
+            now_playing(
+                chat_id,
+                original_chat_id,
+                "stream_2",
+                (user,),
+                "tg",
                 photo=config.STREAM_IMG_URL,
-                caption=_["stream_2"].format(user),
-                reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
         else:
             stream = self._build_stream(queued, video=video)
             try:
@@ -427,87 +382,75 @@ class Call(PyTgCalls):
                     text=_["call_6"],
                 )
             if videoid == "telegram":
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    chat_id=original_chat_id,
+                now_playing(
+                    chat_id,
+                    original_chat_id,
+                    "stream_1",
+                    (config.SUPPORT_GROUP, title[:23], check[0]["dur"], user),
+                    "tg",
                     photo=(
                         config.TELEGRAM_AUDIO_URL
                         if str(streamtype) == "audio"
                         else config.TELEGRAM_VIDEO_URL
                     ),
-                    caption=_["stream_1"].format(
-                        config.SUPPORT_GROUP, title[:23], check[0]["dur"], user
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
             elif videoid == "soundcloud":
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    chat_id=original_chat_id,
+                now_playing(
+                    chat_id,
+                    original_chat_id,
+                    "stream_1",
+                    (config.SUPPORT_GROUP, title[:23], check[0]["dur"], user),
+                    "tg",
                     photo=config.SOUNCLOUD_IMG_URL,
-                    caption=_["stream_1"].format(
-                        config.SUPPORT_GROUP, title[:23], check[0]["dur"], user
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
             else:
-                img = await gen_thumb(videoid)
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    chat_id=original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
+                now_playing(
+                    chat_id,
+                    original_chat_id,
+                    "stream_1",
+                    (
                         f"https://t.me/{app.username}?start=info_{videoid}",
                         title[:23],
                         check[0]["dur"],
                         user,
                     ),
-                    reply_markup=InlineKeyboardMarkup(button),
+                    "stream",
+                    thumb=videoid,
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+        position.start(check[0])
+        prefetch.schedule(chat_id)
 
     async def ping(self):
-        pings = []
-        if config.STRING1:
-            pings.append(self.one.ping)
-        if config.STRING2:
-            pings.append(self.two.ping)
-        if config.STRING3:
-            pings.append(self.three.ping)
-        if config.STRING4:
-            pings.append(self.four.ping)
-        if config.STRING5:
-            pings.append(self.five.ping)
+        pings = [self.get(number).ping for number in assistants]
         return str(round(sum(pings) / len(pings), 3)) if pings else "0"
 
+    async def _start_client(self, number: int, client: PyTgCalls):
+        began = time.perf_counter()
+        try:
+            await asyncio.wait_for(client.start(), config.ASSISTANT_START_TIMEOUT)
+        except asyncio.TimeoutError:
+            quarantine(
+                number,
+                f"call client gave no response in {config.ASSISTANT_START_TIMEOUT}s",
+                unbind=True,
+            )
+        except Exception as e:
+            quarantine(number, f"call client failed: {type(e).__name__}", unbind=True)
+        finally:
+            startup.setdefault(number, {})["calls"] = round(time.perf_counter() - began, 2)
+
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Client...\n")
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
+        await asyncio.gather(
+            *(self._start_client(number, self.get(number)) for number in list(assistants))
+        )
+        LOGGER(__name__).info(startup_report())
+        if not assistants:
+            LOGGER(__name__).error("No assistant could join voice chats, exiting...")
+            exit()
 
     async def decorators(self):
-        for string, client in [
-            (config.STRING1, self.one),
-            (config.STRING2, self.two),
-            (config.STRING3, self.three),
-            (config.STRING4, self.four),
-            (config.STRING5, self.five),
-        ]:
-            if not string:
-                continue
+        for client in self.pool:
             @client.on_update()
             async def _update_handler(_, update: types.Update, _client=client):
                 if isinstance(update, types.StreamEnded):
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import random
+import time
+import wave
+from collections import deque
+
+from pyrogram import raw
+from pytgcalls.exceptions import NoActiveGroupCall, PyTgCallsAlreadyRunning
+
+import config
+from AviaxMusic import LOGGER, userbot
+from AviaxMusic.core.call import Aviax
+from AviaxMusic.core.userbot import (
+    assistantids,
+    assistants,
+    quarantine,
+    quarantined,
+    restore,
+)
+from AviaxMusic.misc import db
+from AviaxMusic.utils.database import is_active_chat
+
+SILENCE_FILE = os.path.join("cache", "silence.wav")
+RTT_HISTORY = 20
+
+health = {}
+
+
+def silence_file() -> str:
+    """One second of 48 kHz mono silence, written once and reused by every probe."""
+    if not os.path.isfile(SILENCE_FILE):
+        os.makedirs(os.path.dirname(SILENCE_FILE), exist_ok=True)
+        with wave.open(SILENCE_FILE, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(48000)
+            f.writeframes(b"\x00\x00" * 48000)
+    return SILENCE_FILE
+
+
+def _record(number: int, ok: bool, rtt: float = None, error: str = None):
+    state = health.setdefault(number, {"rtt": deque(maxlen=RTT_HISTORY)})
+    state["ok"] = ok
+    state["error"] = error
+    state["checked"] = time.time()
+    if rtt is not None:
+        state["rtt"].append(rtt)
+
+
+async def _rtt(client) -> float:
+    began = time.perf_counter()
+    await client.invoke(raw.functions.Ping(ping_id=random.getrandbits(63)))
+    return round((time.perf_counter() - began) * 1000, 2)
+
+
+async def _check(number: int) -> float:
+    client = userbot.get(number)
+    if not client.is_connected:
+        await userbot.connect_assistant(number, client)
+        if client.id not in assistantids:
+            assistantids.append(client.id)
+    rtt = await _rtt(client)
+    calls = Aviax.get(number)
+    try:
+        await calls.start()
+    except PyTgCallsAlreadyRunning:
+        pass
+    # Joining the log group's voice chat would cut off anything playing there.
+    if db.get(config.LOG_GROUP_ID) or await is_active_chat(config.LOG_GROUP_ID):
+        return rtt
+    try:
+        await Aviax.stream_call(silence_file(), calls, video=False)
+    except NoActiveGroupCall:
+        LOGGER(__name__).warning(
+            "Health check skipped the voice chat probe, turn on the videochat of your log group/channel."
+        )
+    return rtt
+
+
+async def probe(number: int) -> bool:
+    try:
+        rtt = await asyncio.wait_for(_check(number), config.HEALTH_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        error = f"no response in {config.HEALTH_CHECK_TIMEOUT}s"
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    else:
+        _record(number, True, rtt=rtt)
+        if number in quarantined:
+            restore(number)
+        return True
+    _record(number, False, error=error)
+    if number not in quarantined:
+        quarantine(number, error)
+    return False
+
+
+async def probe_all():
+    # One assistant at a time, they all share the voice chat of the log group.
+    for number in userbot.pool.numbers():
+        await probe(number)
+
+
+def health_table() -> dict:
+    table = {}
+    for number in userbot.pool.numbers():
+        state = health.get(number, {})
+        history = list(state.get("rtt", []))
+        table[number] = {
+            "ok": number in assistants and number not in quarantined,
+            "error": state.get("error") or quarantined.get(number),
+            "checked": state.get("checked"),
+            "rtt": history[-1] if history else None,
+            "avg": round(sum(history) / len(history), 2) if history else None,
+            "history": history,
+        }
+    return table
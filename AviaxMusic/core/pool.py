@@ -0,0 +1,49 @@
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import config
+
+
+class AssistantPool:
+    """Assistant clients keyed by their assistant number (1, 2, 3, ...)."""
+
+    def __init__(self, members: Dict[int, object] = None):
+        self._members: Dict[int, object] = dict(members or {})
+
+    @classmethod
+    def from_sessions(cls, factory: Callable[[int, str], object]) -> "AssistantPool":
+        return cls(
+            {
+                number: factory(number, session)
+                for number, session in enumerate(config.STRING_SESSIONS, start=1)
+                if session
+            }
+        )
+
+    def map(self, factory: Callable[[int, object], object]) -> "AssistantPool":
+        return AssistantPool(
+            {number: factory(number, member) for number, member in self.items()}
+        )
+
+    def get(self, number: int):
+        try:
+            return self._members.get(int(number))
+        except (TypeError, ValueError):
+            return None
+
+    def __getitem__(self, number: int):
+        return self._members[int(number)]
+
+    def __contains__(self, number) -> bool:
+        return self.get(number) is not None
+
+    def __iter__(self) -> Iterator:
+        return iter(self._members.values())
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def numbers(self) -> List[int]:
+        return list(self._members)
+
+    def items(self) -> List[Tuple[int, object]]:
+        return list(self._members.items())
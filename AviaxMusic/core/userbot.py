@@ -1,170 +1,146 @@
+import asyncio
+import time
+
 from pyrogram import Client
 
 import config
 
 from ..logging import LOGGER
+from .pool import AssistantPool
 
 assistants = []
 assistantids = []
+quarantined = {}
+startup = {}
+
+
+def _timed(stages: dict, stage: str, method):
+    async def wrapper(*args, **kwargs):
+        began = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            stages[stage] = round(time.perf_counter() - began, 2)
+
+    return wrapper
+
+
+def quarantine(number: int, reason: str, unbind: bool = False):
+    """Keep number out of new chat placements until a probe restores it.
+
+    Chats already bound to it stay there; unbind also drops it from assistants,
+    for clients that never started and cannot serve their chats at all.
+    """
+    quarantined[number] = reason
+    if unbind and number in assistants:
+        assistants.remove(number)
+    LOGGER(__name__).error(f"Assistant {number} quarantined: {reason}")
+
+
+def restore(number: int):
+    if quarantined.pop(number, None) is not None:
+        LOGGER(__name__).info(f"Assistant {number} recovered")
+    if number not in assistants:
+        assistants.append(number)
+        assistants.sort()
+
+
+def startup_report() -> str:
+    lines = ["Assistant startup (seconds):"]
+    for number in sorted(startup):
+        stages = startup[number]
+        row = " ".join(
+            f"{stage}={stages[stage]}"
+            for stage in ("connect", "auth", "join", "calls")
+            if stage in stages
+        )
+        state = f"quarantined ({quarantined[number]})" if number in quarantined else "ok"
+        lines.append(f"  {number}: {row} [{state}]")
+    return "\n".join(lines)
 
 
 class Userbot(Client):
     def __init__(self):
-        self.one = Client(
-            name="AviaxAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-            no_updates=True,
-        )
-        self.two = Client(
-            name="AviaxAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-            no_updates=True,
-        )
-        self.three = Client(
-            name="AviaxAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-            no_updates=True,
+        # These clients are also driven by PyTgCalls in core/call.py, which
+        # needs raw updates, so they are not created with no_updates.
+        self.pool = AssistantPool.from_sessions(
+            lambda number, session: Client(
+                name=f"AviaxAss{number}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(session),
+            )
         )
-        self.four = Client(
-            name="AviaxAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-            no_updates=True,
-        )
-        self.five = Client(
-            name="AviaxAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-            no_updates=True,
+
+    def get(self, number: int) -> Client:
+        return self.pool.get(number)
+
+    async def connect_assistant(self, number: int, client: Client):
+        """Connect and authorize client, without the joins and log message of start_assistant."""
+        stages = startup.setdefault(number, {})
+        # Client.start connects and authorizes in one call; timing connect()
+        # separately lets the report split the two.
+        connect = client.connect
+        client.connect = _timed(stages, "connect", connect)
+        began = time.perf_counter()
+        try:
+            await client.start()
+        finally:
+            client.connect = connect
+        stages["auth"] = round(time.perf_counter() - began - stages.get("connect", 0), 2)
+        client.id = client.me.id
+        client.name = client.me.mention
+        client.username = client.me.username
+
+    async def start_assistant(self, number: int, client: Client):
+        await self.connect_assistant(number, client)
+        stages = startup[number]
+        began = time.perf_counter()
+        joins = await asyncio.gather(
+            client.join_chat("NexGenBots"),
+            client.join_chat("NexGenBotsIndia"),
+            client.send_message(config.LOG_GROUP_ID, "Assistant Started"),
+            return_exceptions=True,
         )
+        stages["join"] = round(time.perf_counter() - began, 2)
+        if isinstance(joins[-1], Exception):
+            raise RuntimeError(
+                "failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
+            )
+
+    async def _try_start(self, number: int, client: Client):
+        try:
+            await asyncio.wait_for(
+                self.start_assistant(number, client), config.ASSISTANT_START_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            quarantine(number, f"no response in {config.ASSISTANT_START_TIMEOUT}s")
+        except Exception as e:
+            quarantine(number, str(e) or type(e).__name__)
+        else:
+            assistants.append(number)
+            assistantids.append(client.id)
+            LOGGER(__name__).info(f"Assistant {number} Started as {client.name}")
+            return
+        try:
+            await client.stop()
+        except:
+            pass
 
     async def start(self):
         LOGGER(__name__).info(f"Starting Assistants...")
-        if config.STRING1:
-            await self.one.start()
-            try:
-                await self.one.join_chat("NexGenBots")
-                await self.one.join_chat("NexGenBotsIndia")
-            except:
-                pass
-            assistants.append(1)
-            try:
-                await self.one.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 1 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
-                )
-                exit()
-            self.one.id = self.one.me.id
-            self.one.name = self.one.me.mention
-            self.one.username = self.one.me.username
-            assistantids.append(self.one.id)
-            LOGGER(__name__).info(f"Assistant Started as {self.one.name}")
-
-        if config.STRING2:
-            await self.two.start()
-            try:
-                await self.two.join_chat("NexGenBots")
-                await self.two.join_chat("NexGenBotsIndia")
-            except:
-                pass
-            assistants.append(2)
-            try:
-                await self.two.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 2 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
-                )
-                exit()
-            self.two.id = self.two.me.id
-            self.two.name = self.two.me.mention
-            self.two.username = self.two.me.username
-            assistantids.append(self.two.id)
-            LOGGER(__name__).info(f"Assistant Two Started as {self.two.name}")
-
-        if config.STRING3:
-            await self.three.start()
-            try:
-                await self.three.join_chat("NexGenBots")
-                await self.three.join_chat("NexGenBotsIndia")
-            except:
-                pass
-            assistants.append(3)
-            try:
-                await self.three.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 3 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin! "
-                )
-                exit()
-            self.three.id = self.three.me.id
-            self.three.name = self.three.me.mention
-            self.three.username = self.three.me.username
-            assistantids.append(self.three.id)
-            LOGGER(__name__).info(f"Assistant Three Started as {self.three.name}")
-
-        if config.STRING4:
-            await self.four.start()
-            try:
-                await self.four.join_chat("NexGenBots")
-                await self.four.join_chat("NexGenBotsIndia")
-            except:
-                pass
-            assistants.append(4)
-            try:
-                await self.four.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 4 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin! "
-                )
-                exit()
-            self.four.id = self.four.me.id
-            self.four.name = self.four.me.mention
-            self.four.username = self.four.me.username
-            assistantids.append(self.four.id)
-            LOGGER(__name__).info(f"Assistant Four Started as {self.four.name}")
-
-        if config.STRING5:
-            await self.five.start()
-            try:
-                await self.five.join_chat("NexGenBots")
-                await self.five.join_chat("NexGenBotsIndia")
-            except:
-                pass
-            assistants.append(5)
-            try:
-                await self.five.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 5 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin! "
-                )
-                exit()
-            self.five.id = self.five.me.id
-            self.five.name = self.five.me.mention
-            self.five.username = self.five.me.username
-            assistantids.append(self.five.id)
-            LOGGER(__name__).info(f"Assistant Five Started as {self.five.name}")
+        await asyncio.gather(
+            *(self._try_start(number, client) for number, client in self.pool.items())
+        )
+        assistants.sort()
+        if not assistants:
+            LOGGER(__name__).error("No assistant could be started, exiting...")
+            exit()
 
     async def stop(self):
         LOGGER(__name__).info(f"Stopping Assistants...")
-        try:
-            if config.STRING1:
-                await self.one.stop()
-            if config.STRING2:
-                await self.two.stop()
-            if config.STRING3:
-                await self.three.stop()
-            if config.STRING4:
-                await self.four.stop()
-            if config.STRING5:
-                await self.five.stop()
-        except:
-            pass
+        for client in self.pool:
+            try:
+                await client.stop()
+            except:
+                pass
@@ -1,9 +1,34 @@
 import re
 from typing import Union
 
-import aiohttp
-from bs4 import BeautifulSoup
-from py_yt import VideosSearch
+from AviaxMusic.utils import matches
+from AviaxMusic.utils.scrape import page_meta
+
+
+def _og_title(meta: list):
+    search = None
+    for name, content in meta:
+        if name == "og:title":
+            search = content
+    return search
+
+
+def _song_names(meta: list) -> list:
+    results = []
+    for name, content in meta:
+        if name != "music:song" or "album/" not in content:
+            continue
+        results.append(content.split("album/")[1].split("/")[0].replace("-", " "))
+    return results
+
+
+def _slug(url: str) -> str:
+    """Song slug of an Apple Music link, followed by the track's id."""
+    found = re.search(r"/(?:album|song)/([^/?]+)(?:/(\d+))?", url)
+    if not found:
+        return url
+    track = re.search(r"[?&]i=(\d+)", url)
+    return f"{found.group(1)}:{track.group(1) if track else found.group(2)}"
 
 
 class AppleAPI:
@@ -20,25 +45,23 @@ class AppleAPI:
     async def track(self, url, playid: Union[bool, str] = None):
         if playid:
             url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        search = None
-        for tag in soup.find_all("meta"):
-            if tag.get("property", None) == "og:title":
-                search = tag.get("content", None)
-        if search is None:
-            return False
-        results = VideosSearch(search, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            ytlink = result["link"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        key = f"apple:{_slug(url)}"
+        result = await matches.lookup(key)
+        if result is None:
+            meta = await page_meta(url)
+            if meta is None:
+                return False
+            search = _og_title(meta)
+            if search is None:
+                return False
+            result = await matches.match(key, search)
+            if result is None:
+                return False
+        title = result["title"]
+        ytlink = result["link"]
+        vidid = result["id"]
+        duration_min = result["duration"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         track_details = {
             "title": title,
             "link": ytlink,
@@ -52,20 +75,8 @@ class AppleAPI:
         if playid:
             url = self.base + url
         playlist_id = url.split("playlist/")[1]
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        applelinks = soup.find_all("meta", attrs={"property": "music:song"})
-        results = []
-        for item in applelinks:
-            try:
-                xx = (((item["content"]).split("album/")[1]).split("/")[0]).replace(
-                    "-", " "
-                )
-            except:
-                xx = ((item["content"]).split("album/")[1]).split("/")[0]
-            results.append(xx)
+        meta = await page_meta(url)
+        if meta is None:
+            return False
+        results = _song_names(meta)
         return results, playlist_id
@@ -1,9 +1,19 @@
 import re
 from typing import Union
 
-import aiohttp
-from bs4 import BeautifulSoup
-from py_yt import VideosSearch
+from AviaxMusic.utils import matches
+from AviaxMusic.utils.scrape import page_meta
+
+
+def _og_meta(meta: list) -> tuple:
+    title = None
+    des = ""
+    for name, content in meta:
+        if name == "og:title":
+            title = content
+        if name == "og:description":
+            des = content.split("·")[0]
+    return title, des
 
 
 class RessoAPI:
@@ -20,30 +30,23 @@ class RessoAPI:
     async def track(self, url, playid: Union[bool, str] = None):
         if playid:
             url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        for tag in soup.find_all("meta"):
-            if tag.get("property", None) == "og:title":
-                title = tag.get("content", None)
-            if tag.get("property", None) == "og:description":
-                des = tag.get("content", None)
-                try:
-                    des = des.split("·")[0]
-                except:
-                    pass
-        if des == "":
-            return
-        results = VideosSearch(title, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            ytlink = result["link"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        key = f"resso:{url.split('?')[0].rstrip('/').rsplit('/', 1)[-1]}"
+        result = await matches.lookup(key)
+        if result is None:
+            meta = await page_meta(url)
+            if meta is None:
+                return False
+            title, des = _og_meta(meta)
+            if des == "":
+                return
+            result = await matches.match(key, title)
+            if result is None:
+                return False
+        title = result["title"]
+        ytlink = result["link"]
+        vidid = result["id"]
+        duration_min = result["duration"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         track_details = {
             "title": title,
             "link": ytlink,
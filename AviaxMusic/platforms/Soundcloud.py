@@ -2,9 +2,15 @@ from os import path
 
 from yt_dlp import YoutubeDL
 
+from AviaxMusic.utils.executors import offload
 from AviaxMusic.utils.formatters import seconds_to_min
 
 
+@offload("extractor")
+def _extract(opts: dict, url: str) -> dict:
+    return YoutubeDL(opts).extract_info(url)
+
+
 class SoundAPI:
     def __init__(self):
         self.opts = {
@@ -22,9 +28,8 @@ class SoundAPI:
             return False
 
     async def download(self, url):
-        d = YoutubeDL(self.opts)
         try:
-            info = d.extract_info(url)
+            info = await _extract(self.opts, url)
         except:
             return False
         xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
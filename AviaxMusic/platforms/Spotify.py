@@ -1,10 +1,17 @@
+import asyncio
 import re
+import time
 
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
-from py_yt import VideosSearch
+import aiohttp
 
 import config
+from AviaxMusic.utils import http, matches, metrics
+
+API_URL = "https://api.spotify.com/v1/"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+# Tokens are renewed in the background once they have less than this left.
+TOKEN_MARGIN = 300
+MAX_RETRIES = 3
 
 
 class SpotifyAPI:
@@ -12,15 +19,10 @@ class SpotifyAPI:
         self.regex = r"^(https:\/\/open.spotify.com\/)(.*)$"
         self.client_id = config.SPOTIFY_CLIENT_ID
         self.client_secret = config.SPOTIFY_CLIENT_SECRET
-        if config.SPOTIFY_CLIENT_ID and config.SPOTIFY_CLIENT_SECRET:
-            self.client_credentials_manager = SpotifyClientCredentials(
-                self.client_id, self.client_secret
-            )
-            self.spotify = spotipy.Spotify(
-                client_credentials_manager=self.client_credentials_manager
-            )
-        else:
-            self.spotify = None
+        self._token = None
+        self._expires = 0
+        self._renewing = None
+        self._blocked = {}
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -28,20 +30,103 @@ class SpotifyAPI:
         else:
             return False
 
-    async def track(self, link: str):
-        track = self.spotify.track(link)
+    @staticmethod
+    def _id(link: str) -> str:
+        """Spotify id of an open.spotify.com link, a spotify: uri or a bare id."""
+        return link.split("?")[0].rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+
+    async def _renew(self):
+        async with http.session().post(
+            TOKEN_URL,
+            data={"grant_type": "client_credentials"},
+            auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"Spotify token request failed with status code {response.status}")
+            data = await response.json()
+        self._token = data["access_token"]
+        self._expires = time.time() + data["expires_in"]
+
+    async def _access_token(self) -> str:
+        """Client credentials token, renewed ahead of its expiry.
+
+        A token that is close to expiring is still handed out while its
+        replacement is fetched; only an expired one makes the caller wait.
+        """
+        if not (self.client_id and self.client_secret):
+            raise Exception(
+                "Spotify is not configured, set SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET."
+            )
+        left = self._expires - time.time()
+        if left > TOKEN_MARGIN:
+            return self._token
+        if self._renewing is None or self._renewing.done():
+            self._renewing = asyncio.ensure_future(self._renew())
+            self._renewing.add_done_callback(lambda t: t.cancelled() or t.exception())
+        if left > 0:
+            return self._token
+        await asyncio.shield(self._renewing)
+        return self._token
+
+    async def _get(self, path: str, **params) -> dict:
+        """GET an API path, waiting out the Retry-After of a rate limited endpoint.
+
+        Each endpoint (tracks, playlists, albums, artists) is limited on its own,
+        so a 429 on one does not hold back requests to the others.
+        """
+        endpoint = path.split("/", 1)[0]
+        for attempt in range(MAX_RETRIES + 1):
+            wait = self._blocked.get(endpoint, 0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            token = await self._access_token()
+            with metrics.timed(f"spotify.{endpoint}"):
+                async with http.session().get(
+                    API_URL + path,
+                    params=params,
+                    headers={"Authorization": f"Bearer {token}"},
+                ) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After", "")
+            if attempt == MAX_RETRIES:
+                break
+            if status == 401:
+                self._expires = 0
+            elif status == 429:
+                delay = int(retry_after) if retry_after.isdigit() else 2**attempt
+                self._blocked[endpoint] = max(
+                    self._blocked.get(endpoint, 0), time.monotonic() + delay
+                )
+            elif status >= 500:
+                await asyncio.sleep(2**attempt)
+            else:
+                break
+        raise Exception(f"Spotify {path} failed with status code {status}")
+
+    @staticmethod
+    def _query(track) -> str:
         info = track["name"]
         for artist in track["artists"]:
             fetched = f' {artist["name"]}'
             if "Various Artists" not in fetched:
                 info += fetched
-        results = VideosSearch(info, limit=1)
-        for result in (await results.next())["result"]:
-            ytlink = result["link"]
-            title = result["title"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        return info
+
+    async def track(self, link: str):
+        key = f"spotify:{self._id(link)}"
+        result = await matches.lookup(key)
+        if result is None:
+            track = await self._get(f"tracks/{self._id(link)}")
+            result = await matches.match(key, self._query(track))
+            if result is None:
+                return False
+        ytlink = result["link"]
+        title = result["title"]
+        vidid = result["id"]
+        duration_min = result["duration"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         track_details = {
             "title": title,
             "link": ytlink,
@@ -51,48 +136,33 @@ class SpotifyAPI:
         }
         return track_details, vidid
 
-    async def playlist(self, url):
-        playlist = self.spotify.playlist(url)
-        playlist_id = playlist["id"]
-        results = []
-        for item in playlist["tracks"]["items"]:
-            music_track = item["track"]
-            info = music_track["name"]
-            for artist in music_track["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-        return results, playlist_id
-
-    async def album(self, url):
-        album = self.spotify.album(url)
-        album_id = album["id"]
-        results = []
-        for item in album["tracks"]["items"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-
-        return (
-            results,
-            album_id,
+    async def playlist_page(self, url, offset: int = 0, limit: int = 100):
+        """Search queries for one page of a playlist and the offset of the next page, None at the end."""
+        page = await self._get(
+            f"playlists/{self._id(url)}/tracks",
+            limit=min(limit, 100),
+            offset=offset,
+            additional_types="track",
         )
+        results = [
+            self._query(item["track"]) for item in page["items"] if item.get("track")
+        ]
+        return results, offset + len(page["items"]) if page["next"] else None
+
+    async def album_page(self, url, offset: int = 0, limit: int = 50):
+        """Search queries for one page of an album and the offset of the next page, None at the end."""
+        page = await self._get(
+            f"albums/{self._id(url)}/tracks", limit=min(limit, 50), offset=offset
+        )
+        results = [self._query(item) for item in page["items"]]
+        return results, offset + len(page["items"]) if page["next"] else None
 
     async def artist(self, url):
-        artistinfo = self.spotify.artist(url)
-        artist_id = artistinfo["id"]
-        results = []
-        artisttoptracks = self.spotify.artist_top_tracks(url)
-        for item in artisttoptracks["tracks"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-
-        return results, artist_id
+        artist_id = self._id(url)
+        artistinfo, artisttoptracks = await asyncio.gather(
+            self._get(f"artists/{artist_id}"),
+            self._get(f"artists/{artist_id}/top-tracks", market="US"),
+        )
+        results = [self._query(item) for item in artisttoptracks["tracks"]]
+
+        return results, artistinfo["id"]
@@ -1,30 +1,175 @@
 import os
 import re
-import json
 import yt_dlp
-import random
 import logging
 import aiohttp
 import asyncio
+import time
 from typing import Union
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
-from py_yt import VideosSearch, Playlist
+from py_yt import Playlist, VideosSearch
+from py_yt.core.constants import ResultMode
+
+try:
+    from py_yt.core.playlist import PlaylistCore
+except ImportError:
+    PlaylistCore = None
+from AviaxMusic.core.mongo import mongodb
+from AviaxMusic.misc import db
+from AviaxMusic.utils import downloader, http, matches, mediacache, metrics, ytpool
+from AviaxMusic.utils.cache import TTLCache
+from AviaxMusic.utils.cookies import cookie_pool
 from AviaxMusic.utils.database import is_on_off
 from AviaxMusic.utils.formatters import time_to_seconds
 
-from config import API_URL, VIDEO_API_URL, API_KEY
+from config import (
+    API_KEY,
+    API_URL,
+    DOWNLOAD_SEGMENTS,
+    METADATA_CACHE_TTL,
+    PERSIST_METADATA,
+    SEARCH_CACHE_TTL,
+    VIDEO_API_URL,
+    YTDLP_DOWNLOAD_TIMEOUT,
+)
+
+STREAM_FORMAT = "best[height<=?720][width<=?1280]"
+URL_DEFAULT_TTL = 3600
+URL_REFRESH_MARGIN = 600
+POLL_DELAY = 0.5
+MAX_VIDEO_SIZE = 250 * 1024 * 1024
+
+VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|shorts/|live/|embed/)([\w-]{11})")
+METADATA_PERSIST_TTL = 7 * 24 * 3600
+
+# (video id, quality) -> direct stream URL resolved by yt-dlp -g.
+stream_urls = TTLCache(maxsize=512)
+# video id -> timer renewing its stream URL ahead of expiry, one per video.
+url_refreshes = {}
+# video id -> VideosSearch result of that video.
+video_info = TTLCache(maxsize=1024, ttl=METADATA_CACHE_TTL)
+metadb = mongodb.videometa
+# normalized query -> top 10 VideosSearch results.
+search_results = TTLCache(maxsize=256, ttl=SEARCH_CACHE_TTL)
+# Whether this py_yt has the PlaylistCore internals playlist_page reads pages with.
+_PAGED_PLAYLISTS = PlaylistCore is not None and all(
+    hasattr(PlaylistCore, name) for name in ("_next", "continuationKey", "playlistComponent")
+)
+# (source, video id) -> download shared by every chat asking for it.
+downloading = {}
+# shared download -> number of callers still waiting for it.
+waiters = {}
+
+
+def url_ttl(url: str) -> float:
+    """Seconds a signed stream URL stays usable, read from its expire parameter."""
+    match = re.search(r"[?&/]expire[=/](\d+)", url)
+    if not match:
+        return URL_DEFAULT_TTL
+    return max(0, int(match.group(1)) - time.time() - 30)
+
+
+def _forget(key: tuple, task):
+    waiters.pop(task, None)
+    if downloading.get(key) is task:
+        del downloading[key]
+
+
+async def _wait(task):
+    """Await a shared download, cancelling it when its last waiter is cancelled."""
+    waiters[task] = waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if waiters.get(task) == 1 and not task.done():
+            task.cancel()
+        raise
+    finally:
+        if task in waiters:
+            waiters[task] -= 1
+
+
+async def _single_flight(key: tuple, fetch):
+    """Run fetch() once for concurrent requests of the same key and share its result.
+
+    A cancelled caller leaves the download to the others; it is only stopped
+    once every caller waiting for it has been cancelled.
+    """
+    task = downloading.get(key)
+    if task is None:
+        task = downloading[key] = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda _: _forget(key, task))
+        return await _wait(task)
+    with metrics.timed("download.wait"):
+        return await _wait(task)
+
+
+def _video_id(link: str) -> str:
+    match = VIDEO_ID.search(link)
+    if match:
+        return match.group(1)
+    return link.split('v=')[-1].split('&')[0]
+
+
+def remember(result: dict):
+    """Keep a search result so later lookups of the same video skip the scrape."""
+    if result and result.get("id"):
+        video_info.set(result["id"], result)
+
+
+async def _search_info(link: str):
+    for result in (await VideosSearch(link, limit=1).next())["result"]:
+        return result
+    return None
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+async def _search(query: str):
+    results = (await VideosSearch(query, limit=10).next()).get("result")
+    for result in results or []:
+        remember(result)
+    return results or None
+
+
+async def _load_info(vidid: str, link: str):
+    if PERSIST_METADATA:
+        doc = await metadb.find_one({"_id": vidid})
+        if doc and time.time() - doc["time"] < METADATA_PERSIST_TTL:
+            return doc["info"]
+    result = await _search_info(link)
+    if result and PERSIST_METADATA:
+        await metadb.update_one(
+            {"_id": vidid},
+            {"$set": {"info": result, "time": time.time()}},
+            upsert=True,
+        )
+    return result
+
+
+def _is_queued(vidid: str) -> bool:
+    return any(
+        entry.get("vidid") == vidid for queue in db.values() for entry in queue or []
+    )
 
 
 def cookie_txt_file():
-    cookie_dir = f"{os.getcwd()}/cookies"
-    if not os.path.exists(cookie_dir):
-        return None
-    cookies_files = [f for f in os.listdir(cookie_dir) if f.endswith(".txt")]
-    if not cookies_files:
-        return None
-    cookie_file = os.path.join(cookie_dir, random.choice(cookies_files))
-    return cookie_file
+    return cookie_pool.pick()
+
+
+async def _ytdlp(op: str, cookie_file: str, timeout: float = None, **args):
+    """Run a yt-dlp job and report how it went to the cookie pool."""
+    began = time.perf_counter()
+    try:
+        result = await ytpool.run(op, timeout=timeout, **args)
+    except Exception as e:
+        cookie_pool.report(cookie_file, time.perf_counter() - began, e)
+        raise
+    cookie_pool.report(cookie_file, time.perf_counter() - began)
+    return result
 
 
 async def download_song(link: str):
@@ -34,61 +179,19 @@ async def download_song(link: str):
     for ext in ["mp3", "m4a", "webm"]:
         file_path = f"{download_folder}/{video_id}.{ext}"
         if os.path.exists(file_path):
+            mediacache.touch(file_path)
             return file_path
 
-    song_url = f"{API_URL}/song/{video_id}?api={API_KEY}"
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(10):
-            try:
-                async with session.get(song_url) as response:
-                    if response.status != 200:
-                        raise Exception(f"API request failed with status code {response.status}")
-
-                    data = await response.json()
-                    status = data.get("status", "").lower()
-
-                    if status == "done":
-                        download_url = data.get("link")
-                        if not download_url:
-                            raise Exception("API response did not provide a download URL.")
-                        break
-                    elif status == "downloading":
-                        await asyncio.sleep(4)
-                    else:
-                        error_msg = data.get("error") or data.get("message") or f"Unexpected status '{status}'"
-                        raise Exception(f"API error: {error_msg}")
-            except Exception as e:
-                print(f"[FAIL] {e}")
-                return None
-        else:
-            print("⏱️ Max retries reached. Still downloading...")
-            return None
+    file_path = await _single_flight(
+        ("song", video_id),
+        lambda: _api_download(
+            f"{API_URL}/song/{video_id}?api={API_KEY}", video_id, "mp3", 40, 4
+        ),
+    )
+    mediacache.touch(file_path)
+    return file_path
 
 
-        try:
-            file_format = data.get("format", "mp3")
-            file_extension = file_format.lower()
-            file_name = f"{video_id}.{file_extension}"
-            download_folder = "downloads"
-            os.makedirs(download_folder, exist_ok=True)
-            file_path = os.path.join(download_folder, file_name)
-
-            async with session.get(download_url) as file_response:
-                with open(file_path, 'wb') as f:
-                    while True:
-                        chunk = await file_response.content.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                return file_path
-        except aiohttp.ClientError as e:
-            print(f"Network or client error occurred while downloading: {e}")
-            return None
-        except Exception as e:
-            print(f"Error occurred while downloading song: {e}")
-            return None
-    return None
-
 async def download_video(link: str):
     video_id = link.split('v=')[-1].split('&')[0]
 
@@ -96,100 +199,77 @@ async def download_video(link: str):
     for ext in ["mp4", "webm", "mkv"]:
         file_path = f"{download_folder}/{video_id}.{ext}"
         if os.path.exists(file_path):
+            mediacache.touch(file_path)
             return file_path
 
-    video_url = f"{VIDEO_API_URL}/video/{video_id}?api={API_KEY}"
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(10):
-            try:
-                async with session.get(video_url) as response:
-                    if response.status != 200:
-                        raise Exception(f"API request failed with status code {response.status}")
-
-                    data = await response.json()
-                    status = data.get("status", "").lower()
-
-                    if status == "done":
-                        download_url = data.get("link")
-                        if not download_url:
-                            raise Exception("API response did not provide a download URL.")
-                        break
-                    elif status == "downloading":
-                        await asyncio.sleep(8)
-                    else:
-                        error_msg = data.get("error") or data.get("message") or f"Unexpected status '{status}'"
-                        raise Exception(f"API error: {error_msg}")
-            except Exception as e:
-                print(f"[FAIL] {e}")
-                return None
-        else:
-            print("⏱️ Max retries reached. Still downloading...")
-            return None
-
-
-        try:
-            file_format = data.get("format", "mp4")
-            file_extension = file_format.lower()
-            file_name = f"{video_id}.{file_extension}"
-            download_folder = "downloads"
-            os.makedirs(download_folder, exist_ok=True)
-            file_path = os.path.join(download_folder, file_name)
-
-            async with session.get(download_url) as file_response:
-                with open(file_path, 'wb') as f:
-                    while True:
-                        chunk = await file_response.content.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                return file_path
-        except aiohttp.ClientError as e:
-            print(f"Network or client error occurred while downloading: {e}")
-            return None
-        except Exception as e:
-            print(f"Error occurred while downloading video: {e}")
-            return None
-    return None
-
-async def check_file_size(link):
-    async def get_format_info(link):
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            print("No cookies found. Cannot check file size.")
-            return None
-
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies", cookie_file,
-            "-J",
-            link,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            print(f'Error:\n{stderr.decode()}')
-            return None
-        return json.loads(stdout.decode())
-
-    def parse_size(formats):
-        total_size = 0
-        for format in formats:
-            if 'filesize' in format:
-                total_size += format['filesize']
-        return total_size
-
-    info = await get_format_info(link)
-    if info is None:
+    file_path = await _single_flight(
+        ("video", video_id),
+        lambda: _api_download(
+            f"{VIDEO_API_URL}/video/{video_id}?api={API_KEY}", video_id, "mp4", 80, 8
+        ),
+    )
+    mediacache.touch(file_path)
+    return file_path
+
+
+async def _wait_ready(url: str, max_wait: float, max_delay: float) -> dict:
+    """Poll the download API until the file is ready.
+
+    The delay starts short and doubles up to max_delay, a Retry-After header
+    from the API takes precedence.
+    """
+    delay = POLL_DELAY
+    began = time.monotonic()
+    while True:
+        async with http.session().get(url) as response:
+            if response.status != 200:
+                raise Exception(f"API request failed with status code {response.status}")
+            data = await response.json(content_type=None)
+            retry_after = response.headers.get("Retry-After", "")
+
+        status = data.get("status", "").lower()
+        if status == "done":
+            if not data.get("link"):
+                raise Exception("API response did not provide a download URL.")
+            return data
+        elif status != "downloading":
+            error_msg = data.get("error") or data.get("message") or f"Unexpected status '{status}'"
+            raise Exception(f"API error: {error_msg}")
+
+        if time.monotonic() - began >= max_wait:
+            raise Exception("Max retries reached. Still downloading...")
+        wait = float(retry_after) if retry_after.isdigit() else delay
+        await asyncio.sleep(min(wait, max_delay))
+        delay = min(delay * 2, max_delay)
+
+
+async def _api_download(url: str, video_id: str, default_format: str, max_wait: float, max_delay: float):
+    try:
+        with metrics.timed("download.ready"):
+            data = await _wait_ready(url, max_wait, max_delay)
+    except Exception as e:
+        print(f"[FAIL] {e}")
         return None
 
-    formats = info.get('formats', [])
-    if not formats:
-        print("No formats found.")
+    try:
+        file_format = data.get("format", default_format)
+        file_extension = file_format.lower()
+        file_name = f"{video_id}.{file_extension}"
+        download_folder = "downloads"
+        os.makedirs(download_folder, exist_ok=True)
+        file_path = os.path.join(download_folder, file_name)
+
+        # Written to .part files next to the final path and renamed once the
+        # size checks out, so the exists() checks above never see a partial
+        # file. An interrupted download is continued by the next request.
+        with metrics.timed("download.transfer"):
+            return await downloader.fetch(data["link"], file_path)
+    except aiohttp.ClientError as e:
+        print(f"Network or client error occurred while downloading: {e}")
+        return None
+    except Exception as e:
+        print(f"Error occurred while downloading {video_id}: {e}")
         return None
-
-    total_size = parse_size(formats)
-    return total_size
 
 async def shell_cmd(cmd):
     proc = await asyncio.create_subprocess_shell(
@@ -249,52 +329,57 @@ class YouTubeAPI:
             umm = umm.split("?si=")[0]
         return umm
 
-    async def details(self, link: str, videoid: Union[bool, str] = None):
+    async def info(self, link: str, videoid: Union[bool, str] = None):
+        """Search result of a single video, looked up once per video id.
+
+        Concurrent lookups of the same video share one request. Links without a
+        video id are treated as a text search and give its first result.
+        """
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            if str(duration_min) == "None":
-                duration_sec = 0
-            else:
-                duration_sec = int(time_to_seconds(duration_min))
+        match = VIDEO_ID.search(link)
+        if not match:
+            results = await self.search(link)
+            return results[0] if results else None
+        vidid = match.group(1)
+        return await video_info.fetch(vidid, lambda: _load_info(vidid, link))
+
+    async def search(self, query: str) -> list:
+        """Top 10 results for a text query, kept for SEARCH_CACHE_TTL seconds."""
+        return await search_results.fetch(_normalize(query), lambda: _search(query)) or []
+
+    async def matched(self, query: str):
+        """Search result for the "title artist" query of a Spotify or Apple
+        playlist item, kept in the match table so it is searched only once."""
+        return await matches.match(matches.query_key(query), query, self.search)
+
+    async def details(
+        self, link: str, videoid: Union[bool, str] = None, matched: bool = False
+    ):
+        result = await (self.matched(link) if matched else self.info(link, videoid))
+        title = result["title"]
+        duration_min = result["duration"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        vidid = result["id"]
+        if str(duration_min) == "None":
+            duration_sec = 0
+        else:
+            duration_sec = int(time_to_seconds(duration_min))
         return title, duration_min, duration_sec, thumbnail, vidid
 
     async def title(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-        return title
+        result = await self.info(link, videoid)
+        return result["title"]
 
     async def duration(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            duration = result["duration"]
-        return duration
+        result = await self.info(link, videoid)
+        return result["duration"]
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        return thumbnail
+        result = await self.info(link, videoid)
+        return result["thumbnails"][0]["url"].split("?")[0]
 
     async def video(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
@@ -311,57 +396,96 @@ class YouTubeAPI:
             print(f"Video API failed: {e}")
 
         # Fallback to cookies
+        try:
+            return 1, await self.stream_url(link)
+        except Exception as e:
+            return 0, str(e)
+
+    async def _resolve_url(self, link: str) -> str:
         cookie_file = cookie_txt_file()
         if not cookie_file:
-            return 0, "No cookies found. Cannot download video."
-
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies", cookie_file,
-            "-g",
-            "-f",
-            "best[height<=?720][width<=?1280]",
-            f"{link}",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            raise Exception("No cookies found. Cannot download video.")
+
+        url = await _ytdlp(
+            "resolve", cookie_file, link=link, format=STREAM_FORMAT, cookiefile=cookie_file
+        )
+        vidid = _video_id(link)
+        timer = url_refreshes.pop(vidid, None)
+        if timer:
+            timer.cancel()
+        delay = url_ttl(url) - URL_REFRESH_MARGIN
+        if delay > 0:
+            url_refreshes[vidid] = asyncio.get_running_loop().call_later(
+                delay, self._refresh_url, link, True
+            )
+        return url
+
+    def _refresh_url(self, link: str, queued_only: bool = False):
+        vidid = _video_id(link)
+        if queued_only:
+            url_refreshes.pop(vidid, None)
+        if queued_only and not _is_queued(vidid):
+            return
+        stream_urls.refresh(
+            (vidid, STREAM_FORMAT), lambda: self._resolve_url(link), url_ttl
         )
-        stdout, stderr = await proc.communicate()
-        if stdout:
-            return 1, stdout.decode().split("\n")[0]
-        else:
-            return 0, stderr.decode()
 
-    async def playlist(self, link, limit, user_id, videoid: Union[bool, str] = None):
+    async def stream_url(self, link: str) -> str:
+        """Direct stream URL of link, reused until shortly before its signature expires.
+
+        URLs of tracks still queued are renewed in the background ahead of expiry.
+        """
+        key = (_video_id(link), STREAM_FORMAT)
+        url = stream_urls.get(key)
+        if url is None:
+            return await stream_urls.fetch(
+                key, lambda: self._resolve_url(link), url_ttl
+            )
+        if stream_urls.expires(key) - time.time() < URL_REFRESH_MARGIN:
+            self._refresh_url(link)
+        return url
+
+    async def playlist_page(self, link, token=None, videoid: Union[bool, str] = None):
+        """Video ids on one page of a playlist and the token of the next page, None at the end.
+
+        Pages are read with py_yt's PlaylistCore so that a continuation token is
+        all that has to be kept between pages. If a py_yt release no longer has
+        those internals, the public Playlist API is used and its Playlist object
+        is the token.
+        """
         if videoid:
             link = self.listbase + link
-        try:
-            plist = await Playlist.get(link)
-        except:
-            return []
-
-        videos = plist.get("videos") or []
-        ids: list[str] = []
-        for data in videos[:limit]:
-            if not data:
-                continue
-            vid = data.get("id")
-            if not vid:
-                continue
-            ids.append(vid)
-        return ids
+        if not _PAGED_PLAYLISTS or isinstance(token, Playlist):
+            return await self._playlist_page_public(link, token)
+        page = PlaylistCore(link, "", ResultMode.dict, 2.0)
+        page.continuationKey = token
+        if token:
+            # Continuation responses are appended to the videos already held.
+            page.playlistComponent = {"videos": []}
+        await page._next()
+        videos = (page.playlistComponent or {}).get("videos") or []
+        ids = [data["id"] for data in videos if data and data.get("id")]
+        return ids, page.continuationKey
+
+    async def _playlist_page_public(self, link, playlist=None):
+        if playlist is None:
+            playlist = Playlist(link)
+        before = list(playlist.videos)
+        await playlist.get_next_videos()
+        videos = playlist.videos or []
+        # Later pages may be appended to the videos of the earlier ones.
+        if before and videos[: len(before)] == before:
+            videos = videos[len(before) :]
+        ids = [data["id"] for data in videos if data and data.get("id")]
+        return ids, playlist if playlist.hasMoreVideos else None
 
     async def track(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            vidid = result["id"]
-            yturl = result["link"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        result = await self.info(link, videoid)
+        title = result["title"]
+        duration_min = result["duration"]
+        vidid = result["id"]
+        yturl = result["link"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         track_details = {
             "title": title,
             "link": yturl,
@@ -381,35 +505,32 @@ class YouTubeAPI:
         if not cookie_file:
             return [], link
 
-        ytdl_opts = {"quiet": True, "cookiefile" : cookie_file}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
+        formats_available = []
+        r = await _ytdlp("info", cookie_file, link=link, cookiefile=cookie_file)
+        for format in r["formats"]:
+            try:
+                str(format["format"])
+            except:
+                continue
+            if not "dash" in str(format["format"]).lower():
                 try:
-                    str(format["format"])
+                    format["format"]
+                    format["filesize"]
+                    format["format_id"]
+                    format["ext"]
+                    format["format_note"]
                 except:
                     continue
-                if not "dash" in str(format["format"]).lower():
-                    try:
-                        format["format"]
-                        format["filesize"]
-                        format["format_id"]
-                        format["ext"]
-                        format["format_note"]
-                    except:
-                        continue
-                    formats_available.append(
-                        {
-                            "format": format["format"],
-                            "filesize": format["filesize"],
-                            "format_id": format["format_id"],
-                            "ext": format["ext"],
-                            "format_note": format["format_note"],
-                            "yturl": link,
-                        }
-                    )
+                formats_available.append(
+                    {
+                        "format": format["format"],
+                        "filesize": format["filesize"],
+                        "format_id": format["format_id"],
+                        "ext": format["ext"],
+                        "format_note": format["format_note"],
+                        "yturl": link,
+                    }
+                )
         return formats_available, link
 
     async def slider(
@@ -422,8 +543,7 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        a = VideosSearch(link, limit=10)
-        result = (await a.next()).get("result")
+        result = await self.search(link)
         title = result[query_type]["title"]
         duration_min = result[query_type]["duration"]
         vidid = result[query_type]["id"]
@@ -443,7 +563,6 @@ class YouTubeAPI:
     ) -> str:
         if videoid:
             link = self.base + link
-        loop = asyncio.get_running_loop()
         def audio_dl():
             cookie_file = cookie_txt_file()
             if not cookie_file:
@@ -466,7 +585,7 @@ class YouTubeAPI:
             x.download([link])
             return xyz
 
-        def video_dl():
+        async def video_dl():
             cookie_file = cookie_txt_file()
             if not cookie_file:
                 raise Exception("No cookies found. Cannot download video.")
@@ -479,14 +598,28 @@ class YouTubeAPI:
                 "quiet": True,
                 "cookiefile" : cookie_file,
                 "no_warnings": True,
+                "continuedl": True,
+                "concurrent_fragment_downloads": DOWNLOAD_SEGMENTS,
+                "http_chunk_size": 10485760,
             }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            info = x.extract_info(link, False)
-            xyz = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-            if os.path.exists(xyz):
-                return xyz
-            x.download([link])
-            return xyz
+            # One extraction gives the size of the chosen format and the
+            # download; yt-dlp skips the download when the file already exists.
+            info = await _ytdlp(
+                "download",
+                cookie_file,
+                timeout=YTDLP_DOWNLOAD_TIMEOUT,
+                link=link,
+                options=ydl_optssx,
+                max_size=MAX_VIDEO_SIZE,
+            )
+            if not info["size"]:
+                print("None file Size")
+                return None
+            if info.get("skipped"):
+                total_size_mb = info["size"] / (1024 * 1024)
+                print(f"File size {total_size_mb:.2f} MB exceeds the {MAX_VIDEO_SIZE // (1024 * 1024)}MB limit.")
+                return None
+            return os.path.join("downloads", f"{info['id']}.{info['ext']}")
 
         def song_video_dl():
             cookie_file = cookie_txt_file()
@@ -563,31 +696,18 @@ class YouTubeAPI:
                 direct = True
                 downloaded_file = await download_song(link)
             else:
-                proc = await asyncio.create_subprocess_exec(
-                    "yt-dlp",
-                    "--cookies", cookie_file,
-                    "-g",
-                    "-f",
-                    "best[height<=?720][width<=?1280]",
-                    f"{link}",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, stderr = await proc.communicate()
-                if stdout:
-                    downloaded_file = stdout.decode().split("\n")[0]
+                try:
+                    downloaded_file = await self.stream_url(link)
                     direct = False
-                else:
-                   file_size = await check_file_size(link)
-                   if not file_size:
-                     print("None file Size")
-                     return None, None
-                   total_size_mb = file_size / (1024 * 1024)
-                   if total_size_mb > 250:
-                     print(f"File size {total_size_mb:.2f} MB exceeds the 100MB limit.")
-                     return None, None
+                except Exception:
                    direct = True
-                   downloaded_file = await loop.run_in_executor(None, video_dl)
+                   downloaded_file = await _single_flight(
+                       ("ytdlp", _video_id(link)),
+                       video_dl,
+                   )
+                   if not downloaded_file:
+                     return None, None
+                   mediacache.touch(downloaded_file)
         else:
             direct = True
             downloaded_file = await download_song(link)
@@ -19,9 +19,10 @@ from AviaxMusic.utils.database import (
 )
 from AviaxMusic.utils.decorators.language import languageCB
 from AviaxMusic.utils.formatters import seconds_to_min
-from AviaxMusic.utils.inline import close_markup, stream_markup, stream_markup_timer
+from AviaxMusic.utils.inline import close_markup, stream_markup_timer
+from AviaxMusic.utils.stream import playlist, position, prefetch
 from AviaxMusic.utils.stream.autoclear import auto_clean
-from AviaxMusic.utils.thumbnails import gen_thumb
+from AviaxMusic.utils.stream.notify import now_playing
 from config import (
     BANNED_USERS,
     SOUNCLOUD_IMG_URL,
@@ -166,6 +167,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 popped = check.pop(0)
                 if popped:
                     await auto_clean(popped)
+                await playlist.ready(chat_id)
                 if not check:
                     await CallbackQuery.edit_message_text(
                         f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
@@ -204,13 +206,14 @@ async def del_back_playlist(client, CallbackQuery, _):
         streamtype = check[0]["streamtype"]
         videoid = check[0]["vidid"]
         status = True if str(streamtype) == "video" else None
-        db[chat_id][0]["played"] = 0
+        position.reset(db[chat_id][0])
         exis = (check[0]).get("old_dur")
         if exis:
             db[chat_id][0]["dur"] = exis
             db[chat_id][0]["seconds"] = check[0]["old_second"]
             db[chat_id][0]["speed_path"] = None
             db[chat_id][0]["speed"] = 1.0
+        target = CallbackQuery.message.chat.id
         if "live_" in queued:
             n, link = await YouTube.video(videoid, True)
             if n == 0:
@@ -219,135 +222,113 @@ async def del_back_playlist(client, CallbackQuery, _):
                     reply_markup=close_markup(_),
                 )
             try:
-                image = await YouTube.thumbnail(videoid, True)
-            except:
-                image = None
-            try:
-                await Aviax.skip_stream(chat_id, link, video=status, image=image)
+                await Aviax.skip_stream(chat_id, link, video=status)
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
-            button = stream_markup(_, chat_id)
-            img = await gen_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
-                photo=img,
-                caption=_["stream_1"].format(
+            now_playing(
+                chat_id,
+                target,
+                "stream_1",
+                (
                     f"https://t.me/{app.username}?start=info_{videoid}",
                     title[:23],
                     duration,
                     user,
                 ),
-                reply_markup=InlineKeyboardMarkup(button),
+                "tg",
+                thumb=videoid,
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
         elif "vid_" in queued:
-            mystic = await CallbackQuery.message.reply_text(
-                _["call_7"], disable_web_page_preview=True
-            )
-            try:
-                file_path, direct = await YouTube.download(
-                    videoid,
-                    mystic,
-                    videoid=True,
-                    video=status,
+            mystic = None
+            fetched = await prefetch.take(chat_id, videoid, status)
+            if fetched:
+                file_path, direct = fetched
+            else:
+                mystic = await CallbackQuery.message.reply_text(
+                    _["call_7"], disable_web_page_preview=True
                 )
-            except:
-                return await mystic.edit_text(_["call_6"])
-            try:
-                image = await YouTube.thumbnail(videoid, True)
-            except:
-                image = None
+                try:
+                    file_path, direct = await YouTube.download(
+                        videoid,
+                        mystic,
+                        videoid=True,
+                        video=status,
+                    )
+                except:
+                    return await mystic.edit_text(_["call_6"])
             try:
-                await Aviax.skip_stream(chat_id, file_path, video=status, image=image)
+                await Aviax.skip_stream(chat_id, file_path, video=status)
             except:
-                return await mystic.edit_text(_["call_6"])
-            button = stream_markup(_, chat_id)
-            img = await gen_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
-                photo=img,
-                caption=_["stream_1"].format(
+                return await CallbackQuery.message.reply_text(_["call_6"])
+            now_playing(
+                chat_id,
+                target,
+                "stream_1",
+                (
                     f"https://t.me/{app.username}?start=info_{videoid}",
                     title[:23],
                     duration,
                     user,
                 ),
-                reply_markup=InlineKeyboardMarkup(button),
+                "stream",
+                thumb=videoid,
+                cleanup=[mystic],
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
-            await mystic.delete()
         elif "index_" in queued:
             try:
                 await Aviax.skip_stream(chat_id, videoid, video=status)
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
-            button = stream_markup(_, chat_id)
-            run = await CallbackQuery.message.reply_photo(
-                photo=STREAM_IMG_URL,
-                caption=_["stream_2"].format(user),
-                reply_markup=InlineKeyboardMarkup(button),
+            now_playing(
+                chat_id, target, "stream_2", (user,), "tg", photo=STREAM_IMG_URL
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
         else:
-            if videoid == "telegram":
-                image = None
-            elif videoid == "soundcloud":
-                image = None
-            else:
-                try:
-                    image = await YouTube.thumbnail(videoid, True)
-                except:
-                    image = None
             try:
-                await Aviax.skip_stream(chat_id, queued, video=status, image=image)
+                await Aviax.skip_stream(chat_id, queued, video=status)
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
             if videoid == "telegram":
-                button = stream_markup(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                now_playing(
+                    chat_id,
+                    target,
+                    "stream_1",
+                    (config.SUPPORT_GROUP, title[:23], duration, user),
+                    "tg",
                     photo=TELEGRAM_AUDIO_URL
                     if str(streamtype) == "audio"
                     else TELEGRAM_VIDEO_URL,
-                    caption=_["stream_1"].format(
-                        config.SUPPORT_GROUP, title[:23], duration, user
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
             elif videoid == "soundcloud":
-                button = stream_markup(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                now_playing(
+                    chat_id,
+                    target,
+                    "stream_1",
+                    (config.SUPPORT_GROUP, title[:23], duration, user),
+                    "tg",
                     photo=SOUNCLOUD_IMG_URL
                     if str(streamtype) == "audio"
                     else TELEGRAM_VIDEO_URL,
-                    caption=_["stream_1"].format(
-                        config.SUPPORT_GROUP, title[:23], duration, user
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
             else:
-                button = stream_markup(_, chat_id)
-                img = await gen_thumb(videoid)
-                run = await CallbackQuery.message.reply_photo(
-                    photo=img,
-                    caption=_["stream_1"].format(
+                now_playing(
+                    chat_id,
+                    target,
+                    "stream_1",
+                    (
                         f"https://t.me/{app.username}?start=info_{videoid}",
                         title[:23],
                         duration,
                         user,
                     ),
-                    reply_markup=InlineKeyboardMarkup(button),
+                    "stream",
+                    thumb=videoid,
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
+        position.start(check[0])
+        prefetch.schedule(chat_id)
 
 
 async def markup_timer():
@@ -382,7 +363,7 @@ async def markup_timer():
                     buttons = stream_markup_timer(
                         _,
                         chat_id,
-                        seconds_to_min(playing[0]["played"]),
+                        seconds_to_min(position.elapsed(playing[0])),
                         playing[0]["dur"],
                     )
                     await mystic.edit_reply_markup(
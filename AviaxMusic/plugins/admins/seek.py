@@ -6,6 +6,7 @@ from AviaxMusic.core.call import Aviax
 from AviaxMusic.misc import db
 from AviaxMusic.utils import AdminRightsCheck, seconds_to_min
 from AviaxMusic.utils.inline import close_markup
+from AviaxMusic.utils.stream import position
 from config import BANNED_USERS
 
 
@@ -29,7 +30,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
     if duration_seconds == 0:
         return await message.reply_text(_["admin_22"])
     file_path = playing[0]["file"]
-    duration_played = int(playing[0]["played"])
+    duration_played = position.elapsed(playing[0])
     duration_total_str = playing[0]["dur"]
     is_seek_back = message.command[0][-2] == "c"
     if is_seek_back:
@@ -55,8 +56,14 @@ async def seek_comm(cli, message: Message, _, chat_id):
         if n == 0:
             return await message.reply_text(_["admin_22"])
     check_speed = (playing[0]).get("speed_path")
+    live_speed = None
     if check_speed:
         file_path = check_speed
+    elif float(playing[0].get("speed") or 1.0) != 1.0:
+        # The speed filter runs live on the original file, seek on its timeline.
+        live_speed = float(playing[0]["speed"])
+        to_seek = int(to_seek * live_speed)
+        duration_total_str = playing[0]["old_dur"]
     if "index_" in file_path:
         file_path = playing[0]["vidid"]
     try:
@@ -66,14 +73,12 @@ async def seek_comm(cli, message: Message, _, chat_id):
             seconds_to_min(to_seek),
             duration_total_str,
             playing[0]["streamtype"],
+            live_speed,
         )
     except Exception:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
-    if is_seek_back:
-        db[chat_id][0]["played"] -= duration_to_skip
-    else:
-        db[chat_id][0]["played"] += duration_to_skip
+    position.start(db[chat_id][0], seek_target)
     await mystic.edit_text(
-        text=_["admin_25"].format(seconds_to_min(to_seek), message.from_user.mention),
+        text=_["admin_25"].format(seconds_to_min(seek_target + 1), message.from_user.mention),
         reply_markup=close_markup(_),
     )
\ No newline at end of file
@@ -7,6 +7,7 @@ from AviaxMusic import app
 from AviaxMusic.misc import db
 from AviaxMusic.utils.decorators import AdminRightsCheck
 from AviaxMusic.utils.inline import close_markup
+from AviaxMusic.utils.stream import prefetch
 from config import BANNED_USERS
 
 
@@ -28,6 +29,7 @@ async def admins(Client, message: Message, _, chat_id):
         return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
     random.shuffle(check)
     check.insert(0, popped)
+    prefetch.schedule(chat_id)
     await message.reply_text(
         _["admin_16"].format(message.from_user.mention), reply_markup=close_markup(_)
     )
@@ -29,12 +29,17 @@ async def playback(cli, message: Message, _, chat_id):
     if len(message.command) > 1:
         speed_input = message.text.split(None, 1)[1].strip()
         msg = await message.reply_text(_["admin_31"])
+
+        async def progress(percent):
+            await msg.edit_text(f"{_['admin_31']}\n\n{percent}%")
+
         try:
             await Aviax.speedup_stream(
                 chat_id,
                 file_path,
                 speed_input, 
                 playing,
+                progress,
             )
             return await msg.edit_text(
                 _["admin_34"].format(speed_input, message.from_user.mention)
@@ -103,12 +108,19 @@ async def del_back_playlist(client, CallbackQuery, _):
     mystic = await CallbackQuery.edit_message_text(
         text=_["admin_32"].format(CallbackQuery.from_user.mention),
     )
+
+    async def progress(percent):
+        await mystic.edit_text(
+            f"{_['admin_32'].format(CallbackQuery.from_user.mention)}\n\n{percent}%"
+        )
+
     try:
         await Aviax.speedup_stream(
             chat_id,
             file_path,
             speed,
             playing,
+            progress,
         )
     except:
         if chat_id in checker:
@@ -8,10 +8,9 @@ from pyrogram.types import (
     Message,
     CallbackQuery,
 )
-from py_yt import VideosSearch
 
 import config
-from AviaxMusic import app
+from AviaxMusic import YouTube, app
 from AviaxMusic.misc import _boot_
 from AviaxMusic.plugins.sudo.sudoers import sudoers_list
 from AviaxMusic.utils.database import (
@@ -63,18 +62,15 @@ async def start_pm(client, message: Message, _):
         if name.startswith("inf"):
             m = await message.reply_text("🔎")
             query = name.replace("info_", "", 1)
-            query = f"https://www.youtube.com/watch?v={query}"
-            results = VideosSearch(query, limit=1)
-
-            for result in (await results.next())["result"]:
-                title = result["title"]
-                duration = result["duration"]
-                views = result["viewCount"]["short"]
-                thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-                channellink = result["channel"]["link"]
-                channel = result["channel"]["name"]
-                link = result["link"]
-                published = result["publishedTime"]
+            result = await YouTube.info(query, True)
+            title = result["title"]
+            duration = result["duration"]
+            views = result["viewCount"]["short"]
+            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+            channellink = result["channel"]["link"]
+            channel = result["channel"]["name"]
+            link = result["link"]
+            published = result["publishedTime"]
 
             searched_text = _["start_6"].format(
                 title, duration, views, published, channellink, channel, app.mention
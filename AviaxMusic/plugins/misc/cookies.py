@@ -0,0 +1,16 @@
+import asyncio
+
+from AviaxMusic.utils.cookies import cookie_pool
+
+WATCH_INTERVAL = 60
+
+
+async def watch_cookies():
+    while not await asyncio.sleep(WATCH_INTERVAL):
+        try:
+            cookie_pool.reload()
+        except:
+            continue
+
+
+asyncio.create_task(watch_cookies())
@@ -0,0 +1,15 @@
+import asyncio
+
+import config
+from AviaxMusic.core.health import probe_all
+
+
+async def health_check():
+    while not await asyncio.sleep(config.HEALTH_CHECK_INTERVAL):
+        try:
+            await probe_all()
+        except:
+            continue
+
+
+asyncio.create_task(health_check())
@@ -21,6 +21,7 @@ from AviaxMusic.utils.inline import (
     track_markup,
 )
 from AviaxMusic.utils.logger import play_logs
+from AviaxMusic.utils.stream import playlist
 from AviaxMusic.utils.stream.stream import stream
 from config import BANNED_USERS, lyrical
 
@@ -160,11 +161,7 @@ async def play_commnd(
         if await YouTube.exists(url):
             if "playlist" in url:
                 try:
-                    details = await YouTube.playlist(
-                        url,
-                        config.PLAYLIST_FETCH_LIMIT,
-                        message.from_user.id,
-                    )
+                    details = await playlist.open_cursor("yt", url)
                 except:
                     return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
@@ -203,7 +200,8 @@ async def play_commnd(
                 cap = _["play_10"].format(details["title"], details["duration_min"])
             elif "playlist" in url:
                 try:
-                    details, plist_id = await Spotify.playlist(url)
+                    details = await playlist.open_cursor("spplay", url)
+                    plist_id = url
                 except Exception as e:
                     print(f"play_3 error: fail to process your query | Exception: {e}")
                     return await mystic.edit_text(_["play_3"])
@@ -213,7 +211,8 @@ async def play_commnd(
                 cap = _["play_11"].format(app.mention, message.from_user.mention)
             elif "album" in url:
                 try:
-                    details, plist_id = await Spotify.album(url)
+                    details = await playlist.open_cursor("spalbum", url)
+                    plist_id = url
                 except:
                     return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
@@ -559,22 +558,17 @@ async def play_playlists_command(client, CallbackQuery, _):
     if ptype == "yt":
         spotify = False
         try:
-            result = await YouTube.playlist(
-                videoid,
-                config.PLAYLIST_FETCH_LIMIT,
-                CallbackQuery.from_user.id,
-                True,
-            )
+            result = await playlist.open_cursor("yt", YouTube.listbase + videoid)
         except:
             return await mystic.edit_text(_["play_3"])
     if ptype == "spplay":
         try:
-            result, spotify_id = await Spotify.playlist(videoid)
+            result = await playlist.open_cursor("spplay", videoid)
         except:
             return await mystic.edit_text(_["play_3"])
     if ptype == "spalbum":
         try:
-            result, spotify_id = await Spotify.album(videoid)
+            result = await playlist.open_cursor("spalbum", videoid)
         except:
             return await mystic.edit_text(_["play_3"])
     if ptype == "spartist":
@@ -0,0 +1,47 @@
+from pyrogram import filters
+from pyrogram.types import Message
+
+from AviaxMusic import app
+from AviaxMusic.core.health import health_table
+from AviaxMusic.core.userbot import assistants
+from AviaxMusic.misc import SUDOERS
+from AviaxMusic.utils.scheduler import assistant_load, rebalance
+
+
+@app.on_message(filters.command(["assistantload", "asload"]) & SUDOERS)
+async def assistant_load_table(_, message: Message):
+    table = assistant_load(assistants)
+    if not table:
+        return await message.reply_text("» ɴᴏ ᴀssɪsᴛᴀɴᴛs ᴀʀᴇ ʀᴜɴɴɪɴɢ.")
+    text = "<b>» ᴀssɪsᴛᴀɴᴛ ʟᴏᴀᴅ :</b>\n\n"
+    for number, row in sorted(table.items()):
+        text += (
+            f"<b>{number}.</b> ᴄᴀʟʟs : <code>{row['calls']}</code> | "
+            f"ᴠɪᴅᴇᴏ : <code>{row['video']}</code> | "
+            f"ғᴀɪʟᴜʀᴇs : <code>{row['failures']}</code> | "
+            f"ᴄᴘᴜ : <code>{row['cpu']}%</code> | "
+            f"sᴄᴏʀᴇ : <code>{row['score']}</code>\n"
+        )
+    await message.reply_text(text)
+
+
+@app.on_message(filters.command(["rebalance"]) & SUDOERS)
+async def rebalance_assistants(_, message: Message):
+    mystic = await message.reply_text("» ʀᴇʙᴀʟᴀɴᴄɪɴɢ ɪᴅʟᴇ ᴄʜᴀᴛs...")
+    moved = await rebalance(assistants)
+    await mystic.edit_text(f"» ᴍᴏᴠᴇᴅ <code>{moved}</code> ɪᴅʟᴇ ᴄʜᴀᴛs ᴛᴏ ᴀ ʟᴇss ʟᴏᴀᴅᴇᴅ ᴀssɪsᴛᴀɴᴛ.")
+
+
+@app.on_message(filters.command(["assistanthealth", "ashealth"]) & SUDOERS)
+async def assistant_health_table(_, message: Message):
+    text = "<b>» ᴀssɪsᴛᴀɴᴛ ʜᴇᴀʟᴛʜ :</b>\n\n"
+    for number, row in sorted(health_table().items()):
+        state = "ᴏɴʟɪɴᴇ" if row["ok"] else f"ǫᴜᴀʀᴀɴᴛɪɴᴇᴅ ({row['error']})"
+        history = ", ".join(str(int(rtt)) for rtt in row["history"][-5:]) or "-"
+        text += (
+            f"<b>{number}.</b> {state} | "
+            f"ʀᴛᴛ : <code>{row['rtt']}ms</code> | "
+            f"ᴀᴠɢ : <code>{row['avg']}ms</code> | "
+            f"ʟᴀsᴛ : <code>{history}</code>\n"
+        )
+    await message.reply_text(text)
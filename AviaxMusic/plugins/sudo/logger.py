@@ -2,6 +2,7 @@ from pyrogram import filters
 
 from AviaxMusic import app
 from AviaxMusic.misc import SUDOERS
+from AviaxMusic.utils.cookies import cookie_pool
 from AviaxMusic.utils.database import add_off, add_on
 from AviaxMusic.utils.decorators.language import language
 
@@ -24,6 +25,20 @@ async def logger(client, message, _):
 
 @app.on_message(filters.command(["cookies"]) & SUDOERS)
 @language
-async def logger(client, message, _):
-    await message.reply_document("cookies/logs.csv")
-    await message.reply_text("Please check given file to cookies file choosing logs...")
+async def cookies(client, message, _):
+    cookie_pool.reload()
+    table = cookie_pool.stats()
+    if not table:
+        return await message.reply_text("» ɴᴏ ᴠᴀʟɪᴅ ᴄᴏᴏᴋɪᴇ ғɪʟᴇs ғᴏᴜɴᴅ ɪɴ ᴛʜᴇ ᴄᴏᴏᴋɪᴇs ғᴏʟᴅᴇʀ.")
+    text = "<b>» ᴄᴏᴏᴋɪᴇs :</b>\n\n"
+    for name, row in table.items():
+        state = f"ᴄᴏᴏʟɪɴɢ {row['cooling']}s" if row["cooling"] else "ʀᴇᴀᴅʏ"
+        text += (
+            f"<b>{name}</b> : {state} | "
+            f"ᴏᴋ <code>{row['ok']}</code> | "
+            f"ғᴀɪʟᴇᴅ <code>{row['failed']}</code> | "
+            f"ʟᴀᴛᴇɴᴄʏ <code>{row['latency']}s</code>\n"
+        )
+        if row["error"]:
+            text += f"   ʟᴀsᴛ ᴇʀʀᴏʀ : <code>{row['error']}</code>\n"
+    await message.reply_text(text)
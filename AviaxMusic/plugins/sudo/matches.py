@@ -0,0 +1,41 @@
+import asyncio
+
+from pyrogram import filters
+from pyrogram.types import Message
+
+from AviaxMusic import LOGGER, app
+from AviaxMusic.misc import SUDOERS
+from AviaxMusic.utils import matches
+
+
+async def warm_matches():
+    try:
+        loaded, _ = await matches.warm()
+        LOGGER(__name__).info(f"Loaded {loaded} track matches into memory.")
+    except Exception as e:
+        LOGGER(__name__).warning(f"Warming track matches failed: {e}")
+
+
+async def save_hits():
+    while not await asyncio.sleep(matches.HIT_FLUSH_INTERVAL):
+        try:
+            await matches.flush_hits()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Saving track match plays failed: {e}")
+
+
+@app.on_message(filters.command(["warmmatches"]) & SUDOERS)
+async def warm_command(_, message: Message):
+    limit = message.command[1] if len(message.command) > 1 else ""
+    if limit and not limit.isnumeric():
+        return await message.reply_text("» ᴜsᴀɢᴇ : /warmmatches [ɴᴜᴍʙᴇʀ ᴏғ ᴛʀᴀᴄᴋs]")
+    mystic = await message.reply_text("» ᴡᴀʀᴍɪɴɢ ᴛʀᴀᴄᴋ ᴍᴀᴛᴄʜᴇs...")
+    loaded, searched = await matches.warm(int(limit) if limit else None, refresh=True)
+    await mystic.edit_text(
+        f"» ʟᴏᴀᴅᴇᴅ <code>{loaded}</code> ᴍᴀᴛᴄʜᴇs ᴀɴᴅ ʀᴇ-ᴍᴀᴛᴄʜᴇᴅ "
+        f"<code>{searched}</code> sᴛᴀʟᴇ ᴏɴᴇs ғʀᴏᴍ ᴘʟᴀʏ ʜɪsᴛᴏʀʏ."
+    )
+
+
+asyncio.create_task(warm_matches())
+asyncio.create_task(save_hits())
@@ -0,0 +1,38 @@
+from pyrogram import filters
+from pyrogram.types import Message
+
+from AviaxMusic import app
+from AviaxMusic.misc import SUDOERS
+from AviaxMusic.utils import executors, mediacache
+from AviaxMusic.utils.formatters import convert_bytes
+from AviaxMusic.utils.metrics import summary
+
+
+@app.on_message(filters.command(["metrics", "stagetimes"]) & SUDOERS)
+async def stage_metrics(_, message: Message):
+    table = summary()
+    cache = mediacache.stats()
+    text = (
+        f"<b>» ᴍᴇᴅɪᴀ ᴄᴀᴄʜᴇ :</b> <code>{cache['files']}</code> ғɪʟᴇs, "
+        f"<code>{convert_bytes(cache['size']) or '0'}</code> / <code>{convert_bytes(cache['limit'])}</code>, "
+        f"<code>{cache['hits']}</code> ᴘʟᴀʏs\n\n"
+    )
+    text += "<b>» ᴘᴏᴏʟs :</b>\n"
+    for name, row in executors.stats().items():
+        text += (
+            f"<b>{name}</b> : ᴡᴏʀᴋᴇʀs <code>{row['workers']}</code> | "
+            f"ɪɴ ғʟɪɢʜᴛ <code>{row['pending']}</code> | "
+            f"ǫᴜᴇᴜᴇᴅ <code>{row['queued']}</code>\n"
+        )
+    text += "\n"
+    if not table:
+        return await message.reply_text(text + "» ɴᴏᴛʜɪɴɢ ʜᴀs ʙᴇᴇɴ ᴍᴇᴀsᴜʀᴇᴅ ʏᴇᴛ.")
+    text += "<b>» sᴛᴀɢᴇ ᴛɪᴍᴇs (sᴇᴄᴏɴᴅs) :</b>\n\n"
+    for name, row in table.items():
+        text += (
+            f"<b>{name}</b> : ɴ <code>{row['count']}</code> | "
+            f"ᴀᴠɢ <code>{row['avg']}</code> | "
+            f"ᴘ95 <code>{row['p95']}</code> | "
+            f"ʟᴀsᴛ <code>{row['last']}</code>\n"
+        )
+    await message.reply_text(text)
@@ -12,6 +12,7 @@ from AviaxMusic.utils import AviaxBin, get_channeplayCB, seconds_to_min
 from AviaxMusic.utils.database import get_cmode, is_active_chat, is_music_playing
 from AviaxMusic.utils.decorators.language import language, languageCB
 from AviaxMusic.utils.inline import queue_back_markup, queue_markup
+from AviaxMusic.utils.stream import position
 from config import BANNED_USERS
 
 basic = {}
@@ -92,7 +93,7 @@ async def get_queue(client, message: Message, _):
             DUR,
             "c" if cplay else "g",
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(position.elapsed(got[0])),
             got[0]["dur"],
         )
     )
@@ -111,7 +112,7 @@ async def get_queue(client, message: Message, _):
                                     DUR,
                                     "c" if cplay else "g",
                                     videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
+                                    seconds_to_min(position.elapsed(db[chat_id][0])),
                                     db[chat_id][0]["dur"],
                                 )
                                 await mystic.edit_reply_markup(reply_markup=buttons)
@@ -228,7 +229,7 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             DUR,
             cplay,
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(position.elapsed(got[0])),
             got[0]["dur"],
         )
     ) 
@@ -248,7 +249,7 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
                                     DUR,
                                     cplay,
                                     videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
+                                    seconds_to_min(position.elapsed(db[chat_id][0])),
                                     db[chat_id][0]["dur"],
                                 )
                                 await mystic.edit_reply_markup(reply_markup=buttons)
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """In-memory LRU cache whose entries also expire, with single-flight loading.
+
+    Concurrent fetches of the same missing key share one call of the loader.
+    ttl may be a number of seconds or a function of the loaded value returning one.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._inflight = {}
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires <= time.time():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def expires(self, key) -> float:
+        """Unix time at which key expires, or None if it is not cached."""
+        item = self._data.get(key)
+        return item[0] if item else None
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if callable(ttl):
+            ttl = ttl(value)
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return item[1] if item else default
+
+    def clear(self):
+        self._data.clear()
+
+    def _load(self, key, loader, ttl) -> asyncio.Future:
+        task = self._inflight.get(key)
+        if task is None:
+
+            async def run():
+                value = await loader()
+                if value is not None:
+                    self.set(key, value, ttl)
+                return value
+
+            task = self._inflight[key] = asyncio.ensure_future(run())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def fetch(self, key, loader, ttl=None):
+        """Cached value of key, awaiting loader() to fill it on a miss.
+
+        None results are returned but not cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return await asyncio.shield(self._load(key, loader, ttl))
+
+    def refresh(self, key, loader, ttl=None):
+        """Reload key in the background, the current value is served meanwhile."""
+        task = self._load(key, loader, ttl)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
@@ -0,0 +1,135 @@
+import os
+import time
+
+import config
+from AviaxMusic import LOGGER
+
+COOKIE_DIR = os.path.join(os.getcwd(), "cookies")
+# Errors that point at the cookie rather than at the video.
+COOKIE_ERRORS = ("sign in", "cookie", "not a bot", "login", "429", "403")
+
+
+def _valid(path: str) -> bool:
+    """True for a Netscape cookie file holding at least one youtube cookie."""
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) == 7 and "youtube.com" in fields[0]:
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+class CookiePool:
+    """Cookie files of the cookies folder, handed out round-robin.
+
+    A cookie that fails COOKIE_FAILURES times in a row is skipped for
+    COOKIE_COOLDOWN seconds. Files are validated once, and again only when
+    they change on disk.
+    """
+
+    def __init__(self, directory: str = COOKIE_DIR):
+        self.directory = directory
+        self.cookies = {}
+        self._mtimes = {}
+        self._next = 0
+        self._loaded = False
+
+    def reload(self) -> bool:
+        """Pick up added, changed and removed files, True if anything changed."""
+        try:
+            names = [f for f in os.listdir(self.directory) if f.endswith(".txt")]
+        except OSError:
+            names = []
+        self._loaded = True
+        changed = False
+        seen = set()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            seen.add(path)
+            if self._mtimes.get(path) == mtime:
+                continue
+            self._mtimes[path] = mtime
+            changed = True
+            if not _valid(path):
+                self.cookies.pop(path, None)
+                LOGGER(__name__).warning(f"Ignoring invalid cookie file {name}")
+                continue
+            stats = self.cookies.setdefault(path, _stats())
+            stats["failures"] = 0
+            stats["cooldown"] = 0
+        for path in set(self._mtimes) - seen:
+            self._mtimes.pop(path)
+            self.cookies.pop(path, None)
+            changed = True
+        return changed
+
+    def pick(self) -> str:
+        """Next usable cookie file, or None when there is none."""
+        if not self._loaded:
+            self.reload()
+        paths = sorted(self.cookies)
+        if not paths:
+            return None
+        now = time.time()
+        ready = [p for p in paths if self.cookies[p]["cooldown"] <= now]
+        if not ready:
+            # Everything is cooling down, the one closest to recovery beats none.
+            return min(paths, key=lambda p: self.cookies[p]["cooldown"])
+        self._next %= len(ready)
+        path = ready[self._next]
+        self._next += 1
+        return path
+
+    def report(self, path: str, latency: float, error: Exception = None):
+        stats = self.cookies.get(path)
+        if stats is None:
+            return
+        stats["latency"] = round(latency, 2)
+        stats["used"] = time.time()
+        if error is None:
+            stats["ok"] += 1
+            stats["failures"] = 0
+            return
+        message = str(error)
+        if not any(word in message.lower() for word in COOKIE_ERRORS):
+            return
+        stats["failed"] += 1
+        stats["failures"] += 1
+        stats["error"] = message.strip().splitlines()[-1][:200]
+        if stats["failures"] >= config.COOKIE_FAILURES:
+            stats["cooldown"] = time.time() + config.COOKIE_COOLDOWN
+            LOGGER(__name__).warning(
+                f"Cookie {os.path.basename(path)} cooling down after {stats['failures']} failures: {stats['error']}"
+            )
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            os.path.basename(path): {
+                **stats,
+                "cooling": max(0, int(stats["cooldown"] - now)),
+            }
+            for path, stats in sorted(self.cookies.items())
+        }
+
+
+def _stats() -> dict:
+    return {
+        "ok": 0,
+        "failed": 0,
+        "failures": 0,
+        "cooldown": 0,
+        "latency": None,
+        "used": None,
+        "error": None,
+    }
+
+
+cookie_pool = CookiePool()
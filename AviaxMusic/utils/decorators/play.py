@@ -13,6 +13,7 @@ from AviaxMusic import YouTube, app
 from AviaxMusic.misc import SUDOERS
 from AviaxMusic.utils.database import (
     get_assistant,
+    get_assistant_number,
     get_cmode,
     get_lang,
     get_playmode,
@@ -21,6 +22,7 @@ from AviaxMusic.utils.database import (
     is_maintenance,
 )
 from AviaxMusic.utils.inline import botplaylist_markup
+from AviaxMusic.utils.scheduler import record_join_failure
 from config import PLAYLIST_IMG_URL, SUPPORT_GROUP, adminlist
 from strings import get_string
 
@@ -170,6 +172,7 @@ def PlayWrapper(command):
                 except UserAlreadyParticipant:
                     pass
                 except Exception as e:
+                    record_join_failure(await get_assistant_number(chat_id))
                     return await message.reply_text(
                         _["call_3"].format(app.mention, type(e).__name__)
                     )
@@ -0,0 +1,154 @@
+import asyncio
+import glob
+import json
+import os
+import shutil
+from urllib.parse import urlparse
+
+import aiofiles
+import aiohttp
+
+import config
+from AviaxMusic.utils import http
+
+CHUNK_SIZE = 1024 * 1024
+SEGMENT_MIN_SIZE = 16 * 1024 * 1024
+
+_hosts = {}
+
+
+def _slots(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    if host not in _hosts:
+        _hosts[host] = asyncio.Semaphore(config.DOWNLOAD_CONNECTIONS_PER_HOST)
+    return _hosts[host]
+
+
+def _validator(response):
+    """Strong ETag or Last-Modified of a response, usable in If-Range."""
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+async def _probe(url: str) -> tuple:
+    """Size of url, whether the server answers Range requests and its validator."""
+    async with _slots(url):
+        async with http.session().get(url, headers={"Range": "bytes=0-0"}) as response:
+            if response.status == 206:
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                return (int(total) if total.isdigit() else None), True, _validator(response)
+            if response.status == 200:
+                return response.content_length, False, None
+            raise Exception(f"Download failed with status code {response.status}")
+
+
+async def _fetch_range(url: str, part: str, start: int, end: int = None, validator=None):
+    """Fill part with bytes start..end of url, continuing from what it already holds.
+
+    A continued range is sent with If-Range, so a file that changed since the
+    part was written comes back whole instead of being appended to it.
+    """
+    have = os.path.getsize(part) if os.path.exists(part) else 0
+    if end is not None and start + have > end:
+        return
+    headers = {}
+    if start + have or end is not None:
+        headers["Range"] = f"bytes={start + have}-{'' if end is None else end}"
+    if have and validator:
+        headers["If-Range"] = validator
+    async with _slots(url):
+        async with http.session().get(url, headers=headers) as response:
+            if response.status == 200 and start == 0:
+                # The server ignored the range or the file changed, start it over.
+                have = 0
+            elif response.status != 206:
+                raise Exception(f"Download failed with status code {response.status}")
+            async with aiofiles.open(part, "ab" if have else "wb") as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await f.write(chunk)
+
+
+def _join(parts: list, target: str):
+    with open(target, "wb") as out:
+        for part in parts:
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, out, CHUNK_SIZE)
+
+
+def _remove(paths: list):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _leftovers(path: str) -> list:
+    return glob.glob(f"{glob.escape(path)}.part*")
+
+
+async def _read_state(path: str):
+    try:
+        async with aiofiles.open(f"{path}.partstate") as f:
+            return json.loads(await f.read())
+    except (OSError, ValueError):
+        return None
+
+
+async def _write_state(path: str, state: dict):
+    async with aiofiles.open(f"{path}.partstate", "w") as f:
+        await f.write(json.dumps(state))
+
+
+async def fetch(url: str, path: str) -> str:
+    """Download url to path, in parallel Range segments when the file is large.
+
+    Segments are written to <path>.part<N> along with the server's validator
+    in <path>.partstate. Segments left by a dropped connection or a cancelled
+    call are continued by the next call for the same path, but only if the
+    server still reports the same validator and size. Any other failure, or a
+    server without a validator, removes them. The file is moved into place
+    only once its size matches what the server announced.
+    """
+    size, ranges, validator = await _probe(url)
+    if ranges and size and size >= SEGMENT_MIN_SIZE:
+        count = max(1, min(config.DOWNLOAD_SEGMENTS, size // SEGMENT_MIN_SIZE))
+        step = -(-size // count)
+        bounds = [(i * step, min(size, (i + 1) * step) - 1) for i in range(count)]
+    elif ranges and size:
+        bounds = [(0, size - 1)]
+    else:
+        bounds = [(0, None)]
+    parts = [f"{path}.part{i}" for i in range(len(bounds))]
+    state = {"validator": validator, "size": size, "parts": len(parts)}
+    if not validator or await _read_state(path) != state:
+        _remove(_leftovers(path))
+    if validator:
+        await _write_state(path, state)
+    try:
+        await asyncio.gather(
+            *(
+                _fetch_range(url, part, *span, validator)
+                for part, span in zip(parts, bounds)
+            )
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        if not validator:
+            _remove(_leftovers(path))
+        raise
+    except Exception:
+        _remove(_leftovers(path))
+        raise
+
+    if len(parts) == 1:
+        assembled = parts[0]
+    else:
+        assembled = f"{path}.part"
+        await asyncio.get_running_loop().run_in_executor(None, _join, parts, assembled)
+    got = os.path.getsize(assembled)
+    if size is not None and got != size:
+        _remove(_leftovers(path))
+        raise Exception(f"Downloaded {got} bytes of {os.path.basename(path)}, expected {size}")
+    os.replace(assembled, path)
+    _remove(_leftovers(path))
+    return path
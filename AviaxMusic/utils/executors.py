@@ -0,0 +1,90 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from AviaxMusic.utils import metrics
+
+
+class Pool:
+    """A named, size limited executor that keeps its own queue and run-time metrics."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.pending = 0
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.workers, thread_name_prefix=f"aviax-{self.name}"
+            )
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        queued = time.perf_counter()
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        future = loop.run_in_executor(self.executor, _timed, call)
+        try:
+            started, result = await future
+        finally:
+            self.pending -= 1
+        now = time.perf_counter()
+        metrics.record(f"pool.{self.name}.wait", max(0, started - queued))
+        metrics.record(f"pool.{self.name}.run", now - started)
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _timed(call):
+    return time.perf_counter(), call()
+
+
+pools = {
+    "io": Pool("io", config.IO_WORKERS),
+    "cpu": Pool("cpu", config.CPU_WORKERS),
+    "extractor": Pool("extractor", config.EXTRACTOR_WORKERS),
+}
+
+
+async def run(pool: str, func, *args, **kwargs):
+    """Run a blocking func on the named pool without blocking the event loop."""
+    return await pools[pool].run(func, *args, **kwargs)
+
+
+def offload(pool: str):
+    """Turn a blocking function into a coroutine function that runs on pool."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await pools[pool].run(func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def stats() -> dict:
+    return {
+        name: {
+            "workers": pool.workers,
+            "pending": pool.pending,
+            "queued": max(0, pool.pending - pool.workers),
+        }
+        for name, pool in pools.items()
+    }
+
+
+def shutdown():
+    for pool in pools.values():
+        pool.shutdown()
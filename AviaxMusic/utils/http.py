@@ -0,0 +1,28 @@
+import aiohttp
+
+import config
+
+_session = None
+
+
+def session() -> aiohttp.ClientSession:
+    """Process wide aiohttp session, connections and DNS lookups are reused."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=config.DOWNLOAD_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            ),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=60),
+        )
+    return _session
+
+
+async def close():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,159 @@
+import re
+import time
+
+from py_yt import VideosSearch
+from pymongo import UpdateOne
+
+import config
+from AviaxMusic.core.mongo import mongodb
+from AviaxMusic.utils import metrics
+from AviaxMusic.utils.cache import TTLCache
+
+CANDIDATES = 5
+# Matches below this confidence are searched again after LOW_CONFIDENCE_AGE.
+LOW_CONFIDENCE = 0.5
+LOW_CONFIDENCE_AGE = 24 * 3600
+# Play counts are written to matchdb in batches this many seconds apart.
+HIT_FLUSH_INTERVAL = 60
+
+matchdb = mongodb.trackmatch
+# match key -> stored match: query, YouTube search result, confidence and time.
+matches = TTLCache(maxsize=2048, ttl=config.MATCH_MAX_AGE)
+# match key -> plays not yet written to matchdb and when it was last played.
+hits = {}
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def query_key(query: str) -> str:
+    """Match key of a free text "title artist" query."""
+    return f"query:{normalize(query)}"
+
+
+def confidence(query: str, result: dict) -> float:
+    """Share of the query's words found in the result's title and channel."""
+    wanted = set(normalize(query).split())
+    if not wanted:
+        return 0.0
+    channel = (result.get("channel") or {}).get("name") or ""
+    found = set(normalize(f"{result.get('title') or ''} {channel}").split())
+    return round(len(wanted & found) / len(wanted), 2)
+
+
+def _max_age(doc: dict) -> float:
+    if doc["confidence"] < LOW_CONFIDENCE:
+        return min(LOW_CONFIDENCE_AGE, config.MATCH_MAX_AGE)
+    return config.MATCH_MAX_AGE
+
+
+def _ttl(doc: dict) -> float:
+    return _max_age(doc) - (time.time() - doc["time"])
+
+
+async def _candidates(query: str) -> list:
+    return (await VideosSearch(query, limit=CANDIDATES).next()).get("result") or []
+
+
+async def _load(key: str, query: str, search):
+    doc = await matchdb.find_one({"_id": key})
+    if doc and _ttl(doc) > 0:
+        return doc
+    with metrics.timed("match.search"):
+        results = await (search or _candidates)(query)
+    scored = [
+        (confidence(query, result), -index, result)
+        for index, result in enumerate(results or [])
+        if result and result.get("id")
+    ]
+    if not scored:
+        return None
+    # Best confidence wins, YouTube's own ranking breaks ties.
+    score, _, result = max(scored, key=lambda item: item[:2])
+    doc = {
+        "query": query,
+        "vidid": result["id"],
+        "info": result,
+        "confidence": score,
+        "time": time.time(),
+    }
+    await matchdb.update_one(
+        {"_id": key}, {"$set": doc, "$setOnInsert": {"hits": 0}}, upsert=True
+    )
+    return doc
+
+
+def _hit(key: str):
+    count, _ = hits.get(key, (0, 0))
+    hits[key] = (count + 1, time.time())
+
+
+async def flush_hits():
+    """Write the plays counted since the last flush to matchdb in one batch."""
+    global hits
+    if not hits:
+        return
+    pending, hits = hits, {}
+    try:
+        await matchdb.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": key}, {"$inc": {"hits": count}, "$set": {"played": played}}
+                )
+                for key, (count, played) in pending.items()
+            ],
+            ordered=False,
+        )
+    except Exception:
+        for key, (count, played) in pending.items():
+            now, last = hits.get(key, (0, 0))
+            hits[key] = (count + now, max(played, last))
+        raise
+
+
+async def lookup(key: str):
+    """Stored YouTube result for key, or None if there is no fresh match."""
+    doc = matches.get(key)
+    if doc is None:
+        doc = await matchdb.find_one({"_id": key})
+        if not doc or _ttl(doc) <= 0:
+            return None
+        matches.set(key, doc, _ttl)
+    _hit(key)
+    return doc["info"]
+
+
+async def match(key: str, query: str, search=None):
+    """YouTube result for an external track, searching for query only on a miss.
+
+    key names the track at its source, e.g. "spotify:<id>", "apple:<slug>",
+    "resso:<id>" or query_key(query). search, if given, is awaited with the
+    query and returns the candidate results; VideosSearch is used otherwise.
+    """
+    doc = await matches.fetch(key, lambda: _load(key, query, search), _ttl)
+    if doc is None:
+        return None
+    _hit(key)
+    return doc["info"]
+
+
+async def warm(limit: int = None, refresh: bool = False) -> tuple:
+    """Load the most played matches into memory.
+
+    With refresh, expired ones among them are searched again. Returns how many
+    were loaded and how many were searched again.
+    """
+    loaded = searched = 0
+    cursor = matchdb.find().sort("hits", -1).limit(limit or config.MATCH_WARM_SIZE)
+    async for doc in cursor:
+        if _ttl(doc) > 0:
+            matches.set(doc["_id"], doc, _ttl)
+            loaded += 1
+        elif refresh:
+            matches.pop(doc["_id"])
+            if await matches.fetch(
+                doc["_id"], lambda: _load(doc["_id"], doc["query"], None), _ttl
+            ):
+                searched += 1
+    return loaded, searched
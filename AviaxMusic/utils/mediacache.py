@@ -0,0 +1,199 @@
+import asyncio
+import json
+import os
+import time
+
+import config
+from AviaxMusic import LOGGER
+from AviaxMusic.misc import db
+from AviaxMusic.utils import executors
+
+CACHE_DIR = "downloads"
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+# Files used this recently are kept even when unpinned, e.g. a prefetched track.
+GRACE = 600
+# Leftovers of interrupted downloads older than this are dropped.
+PART_MAX_AGE = 24 * 3600
+# Changes to the index within this many seconds are written in one go.
+SAVE_DELAY = 5
+
+index = {}
+_dirty = False
+_saving = None
+
+
+def _write(data: str):
+    temp = f"{INDEX_FILE}.tmp"
+    with open(temp, "w") as f:
+        f.write(data)
+    os.replace(temp, INDEX_FILE)
+
+
+async def _flush():
+    global _dirty
+    while _dirty:
+        await asyncio.sleep(SAVE_DELAY)
+        _dirty = False
+        try:
+            await executors.run("io", _write, json.dumps(index))
+        except OSError as e:
+            LOGGER(__name__).warning(f"Media cache: saving the index failed: {e}")
+
+
+def _save():
+    """Write the index to disk after SAVE_DELAY, off the event loop."""
+    global _dirty, _saving
+    _dirty = True
+    if _saving is None or _saving.done():
+        _saving = asyncio.ensure_future(_flush())
+
+
+def _is_part(name: str) -> bool:
+    return ".part" in name or name.endswith(".ytdl")
+
+
+def load():
+    """Read the index and bring it in line with what is actually in downloads/."""
+    global index
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        with open(INDEX_FILE) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    names = set()
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if name.startswith(os.path.basename(INDEX_FILE)) or _is_part(name):
+            continue
+        if not os.path.isfile(path):
+            continue
+        names.add(name)
+        if name not in index:
+            stat = os.stat(path)
+            index[name] = _row(name, stat.st_size, stat.st_mtime, 0)
+    for name in set(index) - names:
+        del index[name]
+    _write(json.dumps(index))
+
+
+def _row(name: str, size: int, last: float, hits: int) -> dict:
+    stem, ext = os.path.splitext(name)
+    return {"id": stem, "format": ext.lstrip("."), "size": size, "last": last, "hits": hits}
+
+
+def _cached_name(path: str):
+    if not path or os.path.dirname(os.path.abspath(str(path))) != os.path.abspath(CACHE_DIR):
+        return None
+    if not os.path.isfile(path):
+        return None
+    return os.path.basename(path)
+
+
+def touch(path: str):
+    """Record a use of a cached file, adding it to the index if it is new.
+
+    Only a new file can push the cache over its budget, so only then is it trimmed.
+    """
+    name = _cached_name(path)
+    if not name:
+        return
+    new = name not in index
+    row = index.get(name) or _row(name, 0, 0, 0)
+    row["size"] = os.path.getsize(path)
+    row["last"] = time.time()
+    row["hits"] += 1
+    index[name] = row
+    _save()
+    if new:
+        evict()
+
+
+def release(path: str):
+    """A queue entry using path is done, the file stays cached within the budget."""
+    name = _cached_name(path)
+    if name and name not in index:
+        index[name] = _row(name, os.path.getsize(path), time.time(), 1)
+        _save()
+        evict()
+
+
+def pinned() -> set:
+    """Names of files used by a queued or playing entry.
+
+    YouTube entries keep "vid_<id>" as their file while queued and playing, so
+    every cached file of that video id counts as used.
+    """
+    names = set()
+    ids = set()
+    for file in config.autoclean:
+        names.add(os.path.basename(str(file)))
+    for queue in db.values():
+        for entry in queue or []:
+            for key in ("file", "speed_path"):
+                if entry.get(key):
+                    names.add(os.path.basename(str(entry[key])))
+            if str(entry.get("file")).startswith("vid_"):
+                ids.add(str(entry["file"])[4:])
+    names.update(name for name, row in index.items() if row["id"] in ids)
+    return names
+
+
+def _sweep_parts():
+    now = time.time()
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if not _is_part(name):
+            continue
+        try:
+            if now - os.path.getmtime(path) > PART_MAX_AGE:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def evict():
+    """Delete unpinned files until the cache fits MEDIA_CACHE_LIMIT.
+
+    MEDIA_CACHE_POLICY "lfu" drops the least played files first, anything
+    else the least recently played.
+    """
+    _sweep_parts()
+    total = sum(row["size"] for row in index.values())
+    if total <= config.MEDIA_CACHE_LIMIT:
+        return
+    if config.MEDIA_CACHE_POLICY == "lfu":
+        order = lambda name: (index[name]["hits"], index[name]["last"])
+    else:
+        order = lambda name: index[name]["last"]
+    keep = pinned()
+    now = time.time()
+    removed = 0
+    for name in sorted(index, key=order):
+        if total <= config.MEDIA_CACHE_LIMIT:
+            break
+        if name in keep or now - index[name]["last"] < GRACE:
+            continue
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        total -= index.pop(name)["size"]
+        removed += 1
+    if removed:
+        _save()
+        LOGGER(__name__).info(f"Media cache: evicted {removed} files, {total} bytes kept")
+
+
+def stats() -> dict:
+    return {
+        "files": len(index),
+        "size": sum(row["size"] for row in index.values()),
+        "limit": config.MEDIA_CACHE_LIMIT,
+        "hits": sum(row["hits"] for row in index.values()),
+    }
+
+
+load()
@@ -0,0 +1,37 @@
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+SAMPLES = 200
+
+samples = defaultdict(lambda: deque(maxlen=SAMPLES))
+
+
+def record(name: str, seconds: float):
+    samples[name].append(seconds)
+
+
+@contextmanager
+def timed(name: str):
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - began)
+
+
+def summary() -> dict:
+    """count, average, 95th percentile and last value (seconds) of each metric."""
+    table = {}
+    for name in sorted(samples):
+        values = list(samples[name])
+        if not values:
+            continue
+        ordered = sorted(values)
+        table[name] = {
+            "count": len(values),
+            "avg": round(sum(values) / len(values), 3),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "last": round(values[-1], 3),
+        }
+    return table
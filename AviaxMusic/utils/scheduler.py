@@ -0,0 +1,156 @@
+import time
+from collections import deque
+from typing import Dict, List
+
+import psutil
+
+from AviaxMusic.core.userbot import quarantined
+from AviaxMusic.misc import db
+from AviaxMusic.utils.database import active, activevideo, assdb, assistantdict
+
+# Weights used to turn the load of an assistant into a single score.
+CALL_WEIGHT = 1.0
+VIDEO_WEIGHT = 2.0
+FAILURE_WEIGHT = 3.0
+CPU_WEIGHT = 0.02
+
+FAILURE_WINDOW = 600
+
+failures: Dict[int, deque] = {}
+_ffmpeg: Dict[int, psutil.Process] = {}
+
+
+def record_join_failure(number: int):
+    if number is None:
+        return
+    failures.setdefault(int(number), deque(maxlen=50)).append(time.monotonic())
+
+
+def recent_failures(number: int) -> int:
+    stamps = failures.get(int(number))
+    if not stamps:
+        return 0
+    horizon = time.monotonic() - FAILURE_WINDOW
+    while stamps and stamps[0] < horizon:
+        stamps.popleft()
+    return len(stamps)
+
+
+def _chat_sources(chat_id: int) -> List[str]:
+    try:
+        playing = db[chat_id][0]
+    except (KeyError, IndexError, TypeError):
+        return []
+    return [str(src) for src in (playing.get("file"), playing.get("speed_path")) if src]
+
+
+def ffmpeg_cpu() -> Dict[int, float]:
+    """CPU percent of the ffmpeg children feeding each assistant's calls."""
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return {}
+    alive = {}
+    for proc in children:
+        try:
+            if "ffmpeg" in proc.name():
+                alive[proc.pid] = _ffmpeg.get(proc.pid, proc)
+        except psutil.Error:
+            continue
+    _ffmpeg.clear()
+    _ffmpeg.update(alive)
+
+    usage = {}
+    for proc in alive.values():
+        try:
+            cmdline = " ".join(proc.cmdline())
+            cpu = proc.cpu_percent(None)
+        except psutil.Error:
+            continue
+        for chat_id in active:
+            number = assistantdict.get(chat_id)
+            if number is None:
+                continue
+            if any(src in cmdline for src in _chat_sources(chat_id)):
+                usage[number] = usage.get(number, 0.0) + cpu
+                break
+    return usage
+
+
+def assistant_load(assistants: List[int]) -> Dict[int, dict]:
+    cpu = ffmpeg_cpu()
+    table = {
+        number: {"calls": 0, "video": 0, "failures": 0, "cpu": 0.0, "score": 0.0}
+        for number in assistants
+    }
+    for chat_id in active:
+        number = assistantdict.get(chat_id)
+        if number in table:
+            table[number]["calls"] += 1
+            if chat_id in activevideo:
+                table[number]["video"] += 1
+    for number, row in table.items():
+        row["failures"] = recent_failures(number)
+        row["cpu"] = round(cpu.get(number, 0.0), 1)
+        row["score"] = round(
+            row["calls"] * CALL_WEIGHT
+            + row["video"] * VIDEO_WEIGHT
+            + row["failures"] * FAILURE_WEIGHT
+            + row["cpu"] * CPU_WEIGHT,
+            2,
+        )
+    return table
+
+
+def pick_assistant(assistants: List[int]) -> int:
+    """Least loaded assistant for a new chat, skipping quarantined ones while others are left."""
+    placeable = [number for number in assistants if number not in quarantined]
+    table = assistant_load(placeable or assistants)
+    return min(table, key=lambda number: (table[number]["score"], number))
+
+
+async def rebalance(assistants: List[int]) -> int:
+    """Move idle chat bindings so every assistant holds a fair share.
+
+    Chats with a running stream are never moved; an idle chat only gets a
+    new assistant the next time it starts playing.
+    """
+    if not assistants:
+        return 0
+    idle = {number: [] for number in assistants}
+    busy = {number: 0 for number in assistants}
+    movable = []
+    async for entry in assdb.find({}):
+        chat_id = entry["chat_id"]
+        number = entry.get("assistant")
+        if chat_id in active:
+            if number in busy:
+                busy[number] += 1
+        elif number not in idle:
+            movable.append((chat_id, None))
+        else:
+            idle[number].append(chat_id)
+
+    def held(number):
+        return busy[number] + len(idle[number])
+
+    total = sum(held(number) for number in assistants) + len(movable)
+    share = -(-total // len(assistants))
+    for number in assistants:
+        while held(number) > share and idle[number]:
+            movable.append((idle[number].pop(), number))
+
+    moved = 0
+    for chat_id, previous in movable:
+        number = min(assistants, key=lambda n: (held(n), n))
+        idle[number].append(chat_id)
+        if number == previous:
+            continue
+        assistantdict[chat_id] = number
+        await assdb.update_one(
+            {"chat_id": chat_id},
+            {"$set": {"assistant": number}},
+            upsert=True,
+        )
+        moved += 1
+    return moved
@@ -0,0 +1,103 @@
+import time
+from html.parser import HTMLParser
+
+from AviaxMusic.utils import http, metrics
+from AviaxMusic.utils.cache import TTLCache
+from AviaxMusic.utils.executors import offload
+
+# Pages fetched within this many seconds are served without asking the server.
+PAGE_FRESH = 600
+HEAD_LIMIT = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# url -> <head> of the page, its validators and when it was last checked.
+pages = TTLCache(maxsize=256, ttl=24 * 3600)
+
+
+class _HeadEnd(Exception):
+    pass
+
+
+class _MetaParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            raise _HeadEnd
+        if tag != "meta":
+            return
+        attrs = dict(attrs)
+        name = attrs.get("property") or attrs.get("name")
+        if name and attrs.get("content") is not None:
+            self.meta.append((name, attrs["content"]))
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            raise _HeadEnd
+
+
+@offload("cpu")
+def head_meta(html: str) -> list:
+    """(property or name, content) of every <meta> tag, stopping at the end of <head>."""
+    parser = _MetaParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _HeadEnd:
+        pass
+    return parser.meta
+
+
+async def _read_head(response) -> str:
+    data = bytearray()
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        start = max(0, len(data) - 6)
+        data += chunk
+        end = data.lower().find(b"</head>", start)
+        if end != -1:
+            del data[end + 7 :]
+            break
+        if len(data) > HEAD_LIMIT:
+            break
+    return data.decode(response.charset or "utf-8", errors="ignore")
+
+
+async def page_head(url: str):
+    """<head> of an HTML page, or None if it could not be fetched.
+
+    Only the head is downloaded. Pages are kept by URL, served from memory for
+    PAGE_FRESH seconds and then revalidated with If-None-Match/If-Modified-Since.
+    """
+    cached = pages.get(url)
+    if cached and time.time() - cached["time"] < PAGE_FRESH:
+        return cached["head"]
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["modified"]:
+        headers["If-Modified-Since"] = cached["modified"]
+    with metrics.timed("scrape.fetch"):
+        async with http.session().get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                cached["time"] = time.time()
+                pages.set(url, cached)
+                return cached["head"]
+            if response.status != 200:
+                return None
+            head = await _read_head(response)
+            etag = response.headers.get("ETag")
+            modified = response.headers.get("Last-Modified")
+    pages.set(
+        url, {"head": head, "etag": etag, "modified": modified, "time": time.time()}
+    )
+    return head
+
+
+async def page_meta(url: str):
+    """<meta> tags of a page as (property or name, content), or None if it could not be fetched."""
+    head = await page_head(url)
+    if head is None:
+        return None
+    return await head_meta(head)
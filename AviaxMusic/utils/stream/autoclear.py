@@ -1,5 +1,4 @@
-import os
-
+from AviaxMusic.utils import mediacache
 from config import autoclean
 
 
@@ -7,12 +6,8 @@ async def auto_clean(popped):
     try:
         rem = popped["file"]
         autoclean.remove(rem)
-        count = autoclean.count(rem)
-        if count == 0:
-            if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
-                try:
-                    os.remove(rem)
-                except:
-                    pass
     except:
-        pass
+        return
+    # Downloaded files stay in the media cache, which trims itself to its budget.
+    if autoclean.count(rem) == 0:
+        mediacache.release(rem)
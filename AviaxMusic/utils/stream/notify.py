@@ -0,0 +1,97 @@
+import asyncio
+
+from pyrogram.errors import FloodWait
+from pyrogram.types import InlineKeyboardMarkup
+
+from AviaxMusic import LOGGER, app
+from AviaxMusic.misc import db
+from AviaxMusic.utils.database import get_lang
+from AviaxMusic.utils.inline import stream_markup
+from AviaxMusic.utils.thumbnails import gen_thumb
+from strings import get_string
+
+pending = {}
+workers = {}
+
+
+def now_playing(
+    chat_id: int,
+    original_chat_id: int,
+    caption: str,
+    args: tuple,
+    markup: str,
+    thumb: str = None,
+    photo: str = None,
+    cleanup: list = None,
+):
+    """Queue a "now playing" message for the track at the head of the queue.
+
+    Only the newest notification per chat is kept; an older one that has not
+    been sent yet is dropped, its cleanup messages are still deleted.
+    """
+    queue = db.get(chat_id)
+    if not queue:
+        return
+    cleanup = [message for message in (cleanup or []) if message]
+    stale = pending.get(chat_id)
+    if stale:
+        cleanup = stale["cleanup"] + cleanup
+    pending[chat_id] = {
+        "entry": queue[0],
+        "target": original_chat_id,
+        "caption": caption,
+        "args": args,
+        "markup": markup,
+        "thumb": thumb,
+        "photo": photo,
+        "cleanup": cleanup,
+    }
+    worker = workers.get(chat_id)
+    if not worker or worker.done():
+        workers[chat_id] = asyncio.create_task(_worker(chat_id))
+
+
+def _is_current(chat_id: int, entry: dict) -> bool:
+    queue = db.get(chat_id)
+    return bool(queue) and queue[0] is entry
+
+
+async def _deliver(chat_id: int, event: dict):
+    for message in event["cleanup"]:
+        try:
+            await message.delete()
+        except:
+            pass
+    event["cleanup"] = []
+    if not _is_current(chat_id, event["entry"]):
+        return
+    language = await get_lang(chat_id)
+    _ = get_string(language)
+    photo = await gen_thumb(event["thumb"]) if event["thumb"] else event["photo"]
+    run = await app.send_photo(
+        chat_id=event["target"],
+        photo=photo,
+        caption=_[event["caption"]].format(*event["args"]),
+        reply_markup=InlineKeyboardMarkup(stream_markup(_, chat_id)),
+    )
+    if _is_current(chat_id, event["entry"]):
+        event["entry"]["mystic"] = run
+        event["entry"]["markup"] = event["markup"]
+    else:
+        try:
+            await run.delete()
+        except:
+            pass
+
+
+async def _worker(chat_id: int):
+    while chat_id in pending:
+        event = pending.pop(chat_id)
+        try:
+            await _deliver(chat_id, event)
+        except FloodWait as e:
+            await asyncio.sleep(e.value)
+            pending.setdefault(chat_id, event)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Now playing message failed in {chat_id}: {e}")
+    workers.pop(chat_id, None)
@@ -0,0 +1,185 @@
+import asyncio
+from collections import deque
+
+import config
+from AviaxMusic import LOGGER, Spotify, YouTube
+from AviaxMusic.misc import db
+from AviaxMusic.utils.stream.queue import put_queue
+
+SOURCES = {
+    "yt": "Youtube Playlist",
+    "spplay": "Spotify Playlist",
+    "spalbum": "Spotify Album",
+}
+
+refilling = {}
+
+
+async def _details(search, videoid):
+    try:
+        # Items that are not video ids come from Spotify or Apple playlists.
+        return await YouTube.details(search, videoid, matched=not videoid)
+    except:
+        return None
+
+
+async def resolve_playlist(items, videoid):
+    """Yield YouTube.details of every item in playlist order, None for failures.
+
+    Up to PLAYLIST_RESOLVE_WORKERS items are looked up ahead of the consumer,
+    so the first one is ready as soon as possible while the rest keep going.
+    """
+    items = iter(items)
+    ahead = deque()
+    try:
+        while True:
+            for item in items:
+                ahead.append(asyncio.ensure_future(_details(item, videoid)))
+                if len(ahead) >= config.PLAYLIST_RESOLVE_WORKERS:
+                    break
+            if not ahead:
+                return
+            yield await ahead.popleft()
+    finally:
+        for task in ahead:
+            task.cancel()
+
+
+def playable(detail) -> bool:
+    if detail is None or str(detail[1]) == "None":
+        return False
+    return detail[2] <= config.DURATION_LIMIT
+
+
+async def _page(cursor: dict, count: int) -> tuple:
+    if cursor["source"] == "yt":
+        return await YouTube.playlist_page(cursor["id"], cursor["token"])
+    if cursor["source"] == "spplay":
+        return await Spotify.playlist_page(cursor["id"], cursor["token"] or 0, count)
+    return await Spotify.album_page(cursor["id"], cursor["token"] or 0, count)
+
+
+async def open_cursor(source: str, source_id: str) -> dict:
+    """Cursor over a YouTube playlist link ("yt"), or a Spotify playlist or album.
+
+    Only the first page is fetched, further pages are read as the cursor is taken from.
+    """
+    cursor = {
+        "source": source,
+        "id": source_id,
+        "token": None,
+        "buffer": [],
+        "done": False,
+    }
+    cursor["buffer"], cursor["token"] = await _page(cursor, config.PLAYLIST_CURSOR_BATCH)
+    cursor["done"] = cursor["token"] is None
+    return cursor
+
+
+def exhausted(cursor: dict) -> bool:
+    return cursor["done"] and not cursor["buffer"]
+
+
+async def take(cursor: dict, count: int) -> list:
+    """Next count items of the cursor: video ids for YouTube, search queries for Spotify."""
+    while len(cursor["buffer"]) < count and not cursor["done"]:
+        items, cursor["token"] = await _page(cursor, count - len(cursor["buffer"]))
+        cursor["buffer"].extend(items)
+        cursor["done"] = cursor["token"] is None
+    items = cursor["buffer"][:count]
+    del cursor["buffer"][:count]
+    return items
+
+
+def entry(cursor, original_chat_id, user_name, user_id, video) -> dict:
+    """Queue entry standing in for the rest of a playlist."""
+    return {
+        "title": SOURCES[cursor["source"]],
+        "dur": "ᴘʟᴀʏʟɪsᴛ",
+        "streamtype": "video" if video else "audio",
+        "by": user_name,
+        "user_id": user_id,
+        "chat_id": original_chat_id,
+        "file": "cursor",
+        "vidid": cursor["id"],
+        "seconds": 0,
+        "cursor": cursor,
+    }
+
+
+def is_cursor(queued: dict) -> bool:
+    return "cursor" in queued
+
+
+def _near(chat_id: int):
+    queue = db.get(chat_id) or []
+    for queued in queue[: config.PLAYLIST_CURSOR_AHEAD + 1]:
+        if is_cursor(queued):
+            return queued
+    return None
+
+
+async def _expand(chat_id: int, queued: dict):
+    cursor = queued["cursor"]
+    try:
+        items = await take(cursor, config.PLAYLIST_CURSOR_BATCH)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Playlist {cursor['id']} page failed: {e}")
+        cursor["buffer"], cursor["done"] = [], True
+        items = []
+    tracks = []
+    async for detail in resolve_playlist(items, cursor["source"] == "yt"):
+        if playable(detail):
+            tracks.append(detail)
+    queue = db.get(chat_id) or []
+    index = next((i for i, item in enumerate(queue) if item is queued), None)
+    if index is None:
+        return False
+    for title, duration_min, _, _, vidid in tracks:
+        await put_queue(
+            chat_id,
+            queued["chat_id"],
+            f"vid_{vidid}",
+            title,
+            duration_min,
+            queued["by"],
+            vidid,
+            queued["user_id"],
+            queued["streamtype"],
+            index=index,
+        )
+        index += 1
+    if exhausted(cursor) and queue[index] is queued:
+        del queue[index]
+    return True
+
+
+async def refill(chat_id: int):
+    """Expand cursors within PLAYLIST_CURSOR_AHEAD tracks of the head into tracks."""
+    while True:
+        queued = _near(chat_id)
+        if queued is None or not await _expand(chat_id, queued):
+            return
+
+
+def schedule(chat_id: int):
+    """Start expanding a cursor near the head of the queue, if there is one."""
+    task = refilling.get(chat_id)
+    if task and not task.done():
+        return task
+    if _near(chat_id) is None:
+        return None
+    task = refilling[chat_id] = asyncio.create_task(refill(chat_id))
+    return task
+
+
+async def ready(chat_id: int):
+    """Expand a cursor at the head of the queue before the head is played.
+
+    Cursors further down are expanded in the background.
+    """
+    queue = db.get(chat_id)
+    while queue and is_cursor(queue[0]):
+        await asyncio.shield(schedule(chat_id))
+        queue = db.get(chat_id)
+    schedule(chat_id)
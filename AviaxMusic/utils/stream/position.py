@@ -0,0 +1,33 @@
+import time
+
+
+def elapsed(entry: dict) -> int:
+    """Seconds played of a queue entry, derived from when its clock was last started."""
+    played = entry.get("played", 0)
+    started = entry.get("started")
+    if started is not None:
+        played += time.monotonic() - started
+    duration = int(entry.get("seconds") or 0)
+    if duration:
+        played = min(played, duration)
+    return int(played)
+
+
+def reset(entry: dict):
+    entry["played"] = 0
+    entry["started"] = None
+
+
+def start(entry: dict, offset: int = 0):
+    entry["played"] = offset
+    entry["started"] = time.monotonic()
+
+
+def pause(entry: dict):
+    entry["played"] = elapsed(entry)
+    entry["started"] = None
+
+
+def resume(entry: dict):
+    if entry.get("started") is None:
+        entry["started"] = time.monotonic()
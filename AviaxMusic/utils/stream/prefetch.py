@@ -0,0 +1,62 @@
+import asyncio
+
+import config
+from AviaxMusic import YouTube
+from AviaxMusic.misc import db
+
+prefetched = {}
+
+
+def _upcoming(chat_id: int) -> list:
+    queue = db.get(chat_id) or []
+    keys = []
+    for entry in queue[1 : 1 + config.PREFETCH_AHEAD]:
+        if "vid_" in str(entry.get("file")):
+            keys.append((entry["vidid"], str(entry["streamtype"]) == "video"))
+    return keys
+
+
+async def _fetch(vidid: str, video: bool):
+    return await YouTube.download(
+        vidid, None, videoid=True, video=True if video else None
+    )
+
+
+def schedule(chat_id: int):
+    """Start downloads for the next queued tracks and drop the ones no longer next."""
+    tasks = prefetched.setdefault(chat_id, {})
+    upcoming = _upcoming(chat_id)
+    for key in list(tasks):
+        if key not in upcoming:
+            tasks.pop(key).cancel()
+    for key in upcoming:
+        if key not in tasks:
+            tasks[key] = asyncio.create_task(_fetch(*key))
+
+
+def cancel(chat_id: int):
+    for task in prefetched.pop(chat_id, {}).values():
+        task.cancel()
+
+
+async def take(chat_id: int, vidid: str, video) -> tuple:
+    """Result of the prefetch for this track, or None if there was none.
+
+    A cancelled or failed prefetch gives None, a cancelled caller is not
+    swallowed and takes the prefetch down with it.
+    """
+    task = prefetched.get(chat_id, {}).pop((vidid, bool(video)), None)
+    if task is None:
+        return None
+    try:
+        file_path, direct = await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if task.cancelled():
+            return None
+        task.cancel()
+        raise
+    except Exception:
+        return None
+    if not file_path:
+        return None
+    return file_path, direct
@@ -3,6 +3,7 @@ from typing import Union
 
 from AviaxMusic.misc import db
 from AviaxMusic.utils.formatters import check_duration, seconds_to_min
+from AviaxMusic.utils.stream import position, prefetch
 from config import autoclean, time_to_seconds
 
 
@@ -17,6 +18,7 @@ async def put_queue(
     user_id,
     stream,
     forceplay: Union[bool, str] = None,
+    index: int = None,
 ):
     title = title.title()
     try:
@@ -33,7 +35,6 @@ async def put_queue(
         "file": file,
         "vidid": vidid,
         "seconds": duration_in_seconds,
-        "played": 0,
     }
     if forceplay:
         check = db.get(chat_id)
@@ -42,9 +43,14 @@ async def put_queue(
         else:
             db[chat_id] = []
             db[chat_id].append(put)
+    elif index is not None:
+        db[chat_id].insert(index, put)
     else:
         db[chat_id].append(put)
+    if db[chat_id][0] is put:
+        position.start(put)
     autoclean.append(file)
+    prefetch.schedule(chat_id)
 
 
 async def put_queue_index(
@@ -78,7 +84,6 @@ async def put_queue_index(
         "file": file,
         "vidid": vidid,
         "seconds": dur,
-        "played": 0,
     }
     if forceplay:
         check = db.get(chat_id)
@@ -89,3 +94,5 @@ async def put_queue_index(
             db[chat_id].append(put)
     else:
         db[chat_id].append(put)
+    if db[chat_id][0] is put:
+        position.start(put)
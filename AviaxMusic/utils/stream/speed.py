@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+
+import config
+from AviaxMusic import LOGGER
+from AviaxMusic.misc import db
+
+PLAYBACK_DIR = os.path.join(os.getcwd(), "playback")
+PROGRESS_INTERVAL = 3
+
+_slots = asyncio.Semaphore(config.SPEED_RENDER_WORKERS)
+_rendering = {}
+
+
+def live_parameters(speed: float) -> str:
+    """ffmpeg parameters that play a file at another speed while it streams.
+
+    Audio goes through atempo after the input; video timestamps are rescaled
+    on the input side so the pipeline's own -vf is left alone.
+    """
+    return (
+        f"--audio -atend -filter:a atempo={speed} "
+        f"--video -itsscale {round(1 / speed, 4)}"
+    )
+
+
+def _in_use() -> set:
+    paths = set()
+    for queue in db.values():
+        for entry in queue or []:
+            if entry.get("speed_path"):
+                paths.add(os.path.abspath(entry["speed_path"]))
+    return paths
+
+
+def evict():
+    """Drop the least recently used renders until the cache fits SPEED_CACHE_LIMIT."""
+    files = []
+    for root, _, names in os.walk(PLAYBACK_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    if total <= config.SPEED_CACHE_LIMIT:
+        return
+    in_use = _in_use()
+    for _, size, path in sorted(files):
+        if total <= config.SPEED_CACHE_LIMIT:
+            break
+        if path in in_use or ".part." in os.path.basename(path):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+async def _ffmpeg(file_path: str, speed: float, out: str, duration: int, progress):
+    root, ext = os.path.splitext(out)
+    part = f"{root}.part{ext}"
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-y",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-i",
+        file_path,
+        "-filter:v",
+        f"setpts={round(1 / speed, 4)}*PTS",
+        "-filter:a",
+        f"atempo={speed}",
+        "-progress",
+        "pipe:1",
+        "-nostats",
+        part,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    reported = 0
+    try:
+        async for line in proc.stdout:
+            key, _, value = line.decode(errors="ignore").strip().partition("=")
+            if key != "out_time_ms" or not value.isdigit() or not progress:
+                continue
+            if time.monotonic() - reported < PROGRESS_INTERVAL:
+                continue
+            reported = time.monotonic()
+            done = int(value) / 1_000_000 * speed
+            percent = min(99, int(done * 100 / duration)) if duration else 0
+            try:
+                await progress(percent)
+            except Exception:
+                pass
+        _, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    finally:
+        if proc.returncode != 0 and os.path.exists(part):
+            os.remove(part)
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.decode(errors="ignore").strip() or "ffmpeg failed")
+    os.replace(part, out)
+
+
+async def render(file_path: str, speed: float, duration: int = 0, progress=None) -> str:
+    """Path of a copy of file_path sped up by speed, rendering it if not cached.
+
+    At most SPEED_RENDER_WORKERS renders run at once and requests for the same
+    output share one render. progress is awaited with a percentage while it runs.
+    """
+    out = os.path.join(PLAYBACK_DIR, str(speed), os.path.basename(file_path))
+    if os.path.isfile(out):
+        os.utime(out)
+        return out
+    task = _rendering.get(out)
+    if task is None:
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+
+        async def run():
+            async with _slots:
+                await _ffmpeg(file_path, speed, out, duration, progress)
+
+        task = _rendering[out] = asyncio.create_task(run())
+        task.add_done_callback(lambda _: _rendering.pop(out, None))
+    try:
+        await asyncio.shield(task)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Speed render of {file_path} failed: {e}")
+        raise
+    evict()
+    return out
@@ -1,4 +1,5 @@
 import os
+from contextlib import aclosing
 from random import randint
 from typing import Union
 
@@ -10,10 +11,11 @@ from AviaxMusic.core.call import Aviax
 from AviaxMusic.misc import db
 from AviaxMusic.utils.database import add_active_video_chat, is_active_chat
 from AviaxMusic.utils.exceptions import AssistantErr
-from AviaxMusic.utils.inline import aq_markup, close_markup, stream_markup
+from AviaxMusic.utils.inline import aq_markup, close_markup
 from AviaxMusic.utils.pastebin import AviaxBin
+from AviaxMusic.utils.stream import playlist
+from AviaxMusic.utils.stream.notify import now_playing
 from AviaxMusic.utils.stream.queue import put_queue, put_queue_index
-from AviaxMusic.utils.thumbnails import gen_thumb
 
 
 async def stream(
@@ -39,90 +41,94 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
-            if int(count) == config.PLAYLIST_FETCH_LIMIT:
-                continue
-            try:
+        # A cursor stands for a long playlist, only its first few tracks are queued now.
+        cursor = result if isinstance(result, dict) else None
+        if cursor:
+            result = await playlist.take(cursor, config.PLAYLIST_CURSOR_BATCH)
+        async with aclosing(
+            playlist.resolve_playlist(result, False if spotify else True)
+        ) as details:
+            async for detail in details:
+                if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                    break
+                if not playlist.playable(detail):
+                    continue
                 (
                     title,
                     duration_min,
                     duration_sec,
                     thumbnail,
                     vidid,
-                ) = await YouTube.details(search, False if spotify else True)
-            except:
-                continue
+                ) = detail
 
-            if str(duration_min) == "None":
-                continue
+                if await is_active_chat(chat_id):
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        f"vid_{vidid}",
+                        title,
+                        duration_min,
+                        user_name,
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
+                    )
+                    position = len(db.get(chat_id)) - 1
+                    count += 1
+                    msg += f"{count}. {title[:70]}\n"
+                    msg += f"{_['play_20']} {position}\n\n"
+                else:
+                    if not forceplay:
+                        db[chat_id] = []
+                    status = True if video else None
+                    try:
+                        file_path, direct = await YouTube.download(
+                            vidid, mystic, video=status, videoid=True
+                        )
+                    except:
+                        raise AssistantErr(_["play_14"])
 
-            if duration_sec > config.DURATION_LIMIT:
-                continue
+                    if not file_path:
+                        raise AssistantErr(_["play_14"])
 
-            if await is_active_chat(chat_id):
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                )
-                position = len(db.get(chat_id)) - 1
-                count += 1
-                msg += f"{count}. {title[:70]}\n"
-                msg += f"{_['play_20']} {position}\n\n"
-            else:
-                if not forceplay:
-                    db[chat_id] = []
-                status = True if video else None
-                try:
-                    file_path, direct = await YouTube.download(
-                        vidid, mystic, video=status, videoid=True
+                    await Aviax.join_call(
+                        chat_id,
+                        original_chat_id,
+                        file_path,
+                        video=status,
+                        image=thumbnail,
                     )
-                except:
-                    raise AssistantErr(_["play_14"])
-                
-                if not file_path:
-                    raise AssistantErr(_["play_14"])
-
-                await Aviax.join_call(
-                    chat_id,
-                    original_chat_id,
-                    file_path,
-                    video=status,
-                    image=thumbnail,
-                )
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    file_path if direct else f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                    forceplay=forceplay,
-                )
-                img = await gen_thumb(vidid)
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
-                        f"https://t.me/{app.username}?start=info_{vidid}",
-                        title[:23],
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        file_path if direct else f"vid_{vidid}",
+                        title,
                         duration_min,
                         user_name,
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
-                )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
+                        forceplay=forceplay,
+                    )
+                    now_playing(
+                        chat_id,
+                        original_chat_id,
+                        "stream_1",
+                        (
+                            f"https://t.me/{app.username}?start=info_{vidid}",
+                            title[:23],
+                            duration_min,
+                            user_name,
+                        ),
+                        "stream",
+                        thumb=vidid,
+                    )
+
+        if cursor and not playlist.exhausted(cursor) and db.get(chat_id):
+            db[chat_id].append(
+                playlist.entry(cursor, original_chat_id, user_name, user_id, video)
+            )
+            playlist.schedule(chat_id)
 
         if count == 0:
             return
@@ -206,21 +212,19 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
-            img = await gen_thumb(vidid)
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            now_playing(
+                chat_id,
                 original_chat_id,
-                photo=img,
-                caption=_["stream_1"].format(
+                "stream_1",
+                (
                     f"https://t.me/{app.username}?start=info_{vidid}",
                     title[:23],
                     duration_min,
                     user_name,
                 ),
-                reply_markup=InlineKeyboardMarkup(button),
+                "stream",
+                thumb=vidid,
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
 
     elif streamtype == "soundcloud":
         file_path = result["filepath"]
@@ -265,17 +269,14 @@ async def stream(
                 "audio",
                 forceplay=forceplay,
             )
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            now_playing(
+                chat_id,
                 original_chat_id,
+                "stream_1",
+                (config.SUPPORT_GROUP, title[:23], duration_min, user_name),
+                "tg",
                 photo=config.SOUNCLOUD_IMG_URL,
-                caption=_["stream_1"].format(
-                    config.SUPPORT_GROUP, title[:23], duration_min, user_name
-                ),
-                reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
 
     elif streamtype == "telegram":
         file_path = result["path"]
@@ -324,15 +325,14 @@ async def stream(
             )
             if video:
                 await add_active_video_chat(chat_id)
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            now_playing(
+                chat_id,
                 original_chat_id,
+                "stream_1",
+                (link, title[:23], duration_min, user_name),
+                "tg",
                 photo=config.TELEGRAM_VIDEO_URL if video else config.TELEGRAM_AUDIO_URL,
-                caption=_["stream_1"].format(link, title[:23], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
 
 
     elif streamtype == "live":
@@ -392,21 +392,19 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
-            img = await gen_thumb(vidid)
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            now_playing(
+                chat_id,
                 original_chat_id,
-                photo=img,
-                caption=_["stream_1"].format(
+                "stream_1",
+                (
                     f"https://t.me/{app.username}?start=info_{vidid}",
                     title[:23],
                     duration_min,
                     user_name,
                 ),
-                reply_markup=InlineKeyboardMarkup(button),
+                "tg",
+                thumb=vidid,
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
 
 
     elif streamtype == "index":
@@ -455,13 +453,12 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
-            button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            now_playing(
+                chat_id,
                 original_chat_id,
+                "stream_2",
+                (user_name,),
+                "tg",
                 photo=config.STREAM_IMG_URL,
-                caption=_["stream_2"].format(user_name),
-                reply_markup=InlineKeyboardMarkup(button),
+                cleanup=[mystic],
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
-            await mystic.delete()
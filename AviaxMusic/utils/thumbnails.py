@@ -7,7 +7,8 @@ import aiohttp
 import traceback
 import math
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
-from py_yt import VideosSearch
+
+from AviaxMusic import YouTube
 
 logging.basicConfig(level=logging.INFO)
 
@@ -508,13 +509,7 @@ async def gen_thumb(videoid: str):
         if os.path.isfile(cache_path):
             return cache_path
 
-        url = f"https://www.youtube.com/watch?v={videoid}"
-        results = VideosSearch(url, limit=1)
-        
-        video_data = None
-        for result in (await results.next())["result"]:
-            video_data = result
-            break
+        video_data = await YouTube.info(videoid, True)
         
         if not video_data:
             return None
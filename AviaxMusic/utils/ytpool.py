@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+import sys
+
+import config
+from AviaxMusic import LOGGER
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ytworker.py")
+# Replies carrying a full info dict are far larger than the default line limit.
+REPLY_LIMIT = 64 * 1024 * 1024
+
+
+class JobError(Exception):
+    """yt-dlp reported an error for the job, or it timed out."""
+
+
+class _Worker:
+    def __init__(self, name: str):
+        self.name = name
+        self.proc = None
+        self.jobs = 0
+
+    async def _spawn(self):
+        self.proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=REPLY_LIMIT,
+        )
+        self.jobs = 0
+
+    async def call(self, op: str, args: dict):
+        if self.proc is None or self.proc.returncode is not None:
+            await self._spawn()
+        self.jobs += 1
+        self.proc.stdin.write((json.dumps({"op": op, "args": args}) + "\n").encode())
+        await self.proc.stdin.drain()
+        line = await self.proc.stdout.readline()
+        if not line:
+            self.proc = None
+            raise Exception(f"yt-dlp worker {self.name} exited")
+        reply = json.loads(line)
+        if not reply["ok"]:
+            raise JobError(reply["error"])
+        return reply["result"]
+
+    def stop(self):
+        if self.proc is not None and self.proc.returncode is None:
+            self.proc.kill()
+        self.proc = None
+
+
+# Downloads hold a worker for minutes, so they get workers of their own and
+# never keep the short resolve/info jobs waiting.
+_idle = {"jobs": asyncio.Queue(), "download": asyncio.Queue()}
+_workers = {"jobs": [], "download": []}
+
+
+def _size(lane: str) -> int:
+    if lane == "download":
+        return config.YTDLP_DOWNLOAD_WORKERS
+    return config.YTDLP_WORKERS
+
+
+def _ensure_workers():
+    for lane, workers in _workers.items():
+        while len(workers) < _size(lane):
+            worker = _Worker(f"{lane}-{len(workers) + 1}")
+            workers.append(worker)
+            _idle[lane].put_nowait(worker)
+
+
+async def run(op: str, timeout: float = None, **args):
+    """Run a job ("resolve", "info" or "download") on the next free worker.
+
+    Downloads run on their own YTDLP_DOWNLOAD_WORKERS workers. A job that runs
+    over its timeout, or is cancelled, takes its worker down with it. Workers
+    are also replaced after YTDLP_WORKER_JOBS jobs.
+    """
+    _ensure_workers()
+    idle = _idle["download" if op == "download" else "jobs"]
+    worker = await idle.get()
+    timeout = timeout or config.YTDLP_JOB_TIMEOUT
+    try:
+        return await asyncio.wait_for(worker.call(op, args), timeout)
+    except JobError:
+        raise
+    except asyncio.TimeoutError:
+        worker.stop()
+        LOGGER(__name__).warning(f"yt-dlp {op} job timed out, worker {worker.name} restarted")
+        raise JobError(f"yt-dlp {op} timed out after {timeout}s") from None
+    except BaseException:
+        # The reply may still arrive later and would answer the next job.
+        worker.stop()
+        raise
+    finally:
+        if worker.jobs >= config.YTDLP_WORKER_JOBS:
+            worker.stop()
+        idle.put_nowait(worker)
+
+
+async def start():
+    """Spawn the workers up front so the first request does not pay for it."""
+    _ensure_workers()
+    await asyncio.gather(
+        *(
+            worker._spawn()
+            for workers in _workers.values()
+            for worker in workers
+            if worker.proc is None
+        )
+    )
+
+
+def stop():
+    for workers in _workers.values():
+        for worker in workers:
+            worker.stop()
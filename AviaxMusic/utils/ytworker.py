@@ -0,0 +1,85 @@
+"""yt-dlp worker process used by AviaxMusic.utils.ytpool.
+
+Started as a script, it reads one JSON job per line on stdin and answers each
+with one JSON line on stdout. YoutubeDL instances are kept between jobs so
+the extractors stay imported and initialised.
+"""
+import json
+import os
+import sys
+
+# This file runs as a script from AviaxMusic/utils, where http.py would
+# shadow the standard library module of the same name.
+_here = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != _here]
+
+import yt_dlp  # noqa: E402
+
+_instances = {}
+
+
+def _ydl(options: dict) -> yt_dlp.YoutubeDL:
+    key = json.dumps(options, sort_keys=True)
+    if key not in _instances:
+        _instances[key] = yt_dlp.YoutubeDL(
+            {"quiet": True, "no_warnings": True, **options}
+        )
+    return _instances[key]
+
+
+def resolve(link: str, format: str, cookiefile: str = None) -> str:
+    """Direct media URL of link in format, like yt-dlp -g."""
+    info = _ydl({"format": format, "cookiefile": cookiefile}).extract_info(
+        link, download=False
+    )
+    if "requested_formats" in info:
+        return info["requested_formats"][0]["url"]
+    return info["url"]
+
+
+def info(link: str, cookiefile: str = None) -> dict:
+    """Full info dict of link, like yt-dlp -J."""
+    ydl = _ydl({"cookiefile": cookiefile})
+    return ydl.sanitize_info(ydl.extract_info(link, download=False))
+
+
+def _size(info: dict) -> int:
+    """Size in bytes of the format yt-dlp selected, 0 when it is unknown."""
+    formats = info.get("requested_formats") or [info]
+    return sum(f.get("filesize") or f.get("filesize_approx") or 0 for f in formats)
+
+
+def download(link: str, options: dict, max_size: int = None) -> dict:
+    """Download link, unless the selected format is larger than max_size.
+
+    The video is extracted once; the same info dict gives the size check and
+    is then handed back to yt-dlp for the download.
+    """
+    ydl = _ydl(options)
+    info = ydl.extract_info(link, download=False)
+    result = {"id": info["id"], "ext": info["ext"], "size": _size(info)}
+    if max_size is not None and not 0 < result["size"] <= max_size:
+        return {**result, "skipped": True}
+    ydl.process_ie_result(info, download=True)
+    return result
+
+
+JOBS = {"resolve": resolve, "info": info, "download": download}
+
+
+def main():
+    out = sys.stdout
+    # Anything yt-dlp prints must not end up in the reply channel.
+    sys.stdout = sys.stderr
+    for line in sys.stdin:
+        job = json.loads(line)
+        try:
+            reply = {"ok": True, "result": JOBS[job["op"]](**job["args"])}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e) or type(e).__name__}
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    main()
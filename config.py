@@ -1,5 +1,5 @@
 import re
-from os import getenv
+from os import environ, getenv, path
 
 from dotenv import load_dotenv
 from pyrogram import filters
@@ -61,6 +61,69 @@ SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", None)
 # Maximum limit for fetching playlist's track from youtube, spotify, apple links.
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
 
+# Number of playlist tracks looked up at once, ahead of the one being queued.
+PLAYLIST_RESOLVE_WORKERS = int(getenv("PLAYLIST_RESOLVE_WORKERS", 5))
+
+# Tracks read from a YouTube or Spotify playlist/album each time its queue entry runs low.
+PLAYLIST_CURSOR_BATCH = int(getenv("PLAYLIST_CURSOR_BATCH", 5))
+
+# How many tracks before the head a playlist's queue entry is expanded into its next tracks.
+PLAYLIST_CURSOR_AHEAD = int(getenv("PLAYLIST_CURSOR_AHEAD", 2))
+
+# Number of upcoming queued tracks downloaded in the background while the current one plays.
+PREFETCH_AHEAD = int(getenv("PREFETCH_AHEAD", 1))
+
+# How /speed changes the playback rate: "live" applies an ffmpeg filter while streaming,
+# "render" writes a sped up copy first (the old behaviour) and plays that.
+SPEED_MODE = getenv("SPEED_MODE", "live").lower()
+
+# Number of sped up copies rendered at the same time in "render" mode.
+SPEED_RENDER_WORKERS = int(getenv("SPEED_RENDER_WORKERS", 2))
+
+# Maximum size of the rendered copies kept in the playback folder (in mb).
+SPEED_CACHE_LIMIT = int(getenv("SPEED_CACHE_LIMIT", 1024)) * 1024 * 1024
+
+# How long YouTube video details are kept in memory (in seconds).
+METADATA_CACHE_TTL = int(getenv("METADATA_CACHE_TTL", 21600))
+
+# Also keep YouTube video details in MongoDB so they survive restarts.
+PERSIST_METADATA = bool(getenv("PERSIST_METADATA", False))
+
+# How long a Spotify/Apple/Resso track or text query stays matched to the same YouTube video (in days).
+MATCH_MAX_AGE = int(getenv("MATCH_MAX_AGE", 30)) * 24 * 3600
+
+# Number of most played matches loaded into memory at startup.
+MATCH_WARM_SIZE = int(getenv("MATCH_WARM_SIZE", 500))
+
+# How long the results of a text search are reused (in seconds).
+SEARCH_CACHE_TTL = int(getenv("SEARCH_CACHE_TTL", 600))
+
+# Number of parallel connections used for one large download, and the limit per host.
+DOWNLOAD_SEGMENTS = int(getenv("DOWNLOAD_SEGMENTS", 4))
+DOWNLOAD_CONNECTIONS_PER_HOST = int(getenv("DOWNLOAD_CONNECTIONS_PER_HOST", 8))
+
+# Maximum size of the downloads folder (in mb), and which files go first when it is full: "lru" or "lfu".
+MEDIA_CACHE_LIMIT = int(getenv("MEDIA_CACHE_LIMIT", 4096)) * 1024 * 1024
+MEDIA_CACHE_POLICY = getenv("MEDIA_CACHE_POLICY", "lru").lower()
+
+# Number of persistent yt-dlp worker processes for lookups and for downloads, jobs each one
+# runs before it is replaced, and how long a lookup or a download may take (in seconds).
+YTDLP_WORKERS = int(getenv("YTDLP_WORKERS", 2))
+YTDLP_DOWNLOAD_WORKERS = int(getenv("YTDLP_DOWNLOAD_WORKERS", 1))
+YTDLP_WORKER_JOBS = int(getenv("YTDLP_WORKER_JOBS", 50))
+YTDLP_JOB_TIMEOUT = int(getenv("YTDLP_JOB_TIMEOUT", 60))
+YTDLP_DOWNLOAD_TIMEOUT = int(getenv("YTDLP_DOWNLOAD_TIMEOUT", 900))
+
+# Worker counts of the executors blocking work runs on: network clients, html parsing
+# and extractors.
+IO_WORKERS = int(getenv("IO_WORKERS", 8))
+CPU_WORKERS = int(getenv("CPU_WORKERS", 2))
+EXTRACTOR_WORKERS = int(getenv("EXTRACTOR_WORKERS", 4))
+
+# Consecutive failures after which a cookie file is rested, and for how long (in seconds).
+COOKIE_FAILURES = int(getenv("COOKIE_FAILURES", 3))
+COOKIE_COOLDOWN = int(getenv("COOKIE_COOLDOWN", 900))
+
 
 # Telegram audio and video file size limit (in bytes)
 TG_AUDIO_FILESIZE_LIMIT = int(getenv("TG_AUDIO_FILESIZE_LIMIT", 104857600))
@@ -69,11 +132,38 @@ TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", 2145386496))
 
 
 # Get your pyrogram v2 session from Replit
-STRING1 = getenv("STRING_SESSION", None)
-STRING2 = getenv("STRING_SESSION2", None)
-STRING3 = getenv("STRING_SESSION3", None)
-STRING4 = getenv("STRING_SESSION4", None)
-STRING5 = getenv("STRING_SESSION5", None)
+# Add as many assistants as you need: STRING_SESSION, STRING_SESSION2, STRING_SESSION3, ...
+# or put one session per line in the file pointed to by STRING_SESSIONS_FILE.
+STRING_SESSIONS_FILE = getenv("STRING_SESSIONS_FILE", None)
+
+
+def _load_string_sessions():
+    numbers = [
+        int(match.group(1) or 1)
+        for match in (re.match(r"^STRING_SESSION(\d*)$", key) for key in environ)
+        if match
+    ]
+    sessions = [
+        getenv(f"STRING_SESSION{number}")
+        or (getenv("STRING_SESSION") if number == 1 else None)
+        for number in range(1, max(numbers, default=0) + 1)
+    ]
+    if STRING_SESSIONS_FILE and path.isfile(STRING_SESSIONS_FILE):
+        with open(STRING_SESSIONS_FILE) as file:
+            sessions.extend(line.strip() for line in file if line.strip())
+    return sessions
+
+
+# Index 0 is assistant number 1. Empty slots keep the numbering stable for
+# chats already bound to an assistant in the database.
+STRING_SESSIONS = _load_string_sessions()
+
+# Seconds each assistant gets to connect and start its call client before it is quarantined
+ASSISTANT_START_TIMEOUT = int(getenv("ASSISTANT_START_TIMEOUT", 30))
+
+# Seconds between assistant health checks, and how long a single check may take
+HEALTH_CHECK_INTERVAL = int(getenv("HEALTH_CHECK_INTERVAL", 300))
+HEALTH_CHECK_TIMEOUT = int(getenv("HEALTH_CHECK_TIMEOUT", 20))
 
 
 BANNED_USERS = filters.user()